@@ -7,76 +7,248 @@ All data models extend DataclassBase for consistent from_dict/to_dict support.
 from __future__ import annotations
 
 import json
+import sys
 import time
 import types
 from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _cached_type_hints(cls) -> Dict[str, Any]:
+    """Resolve and cache type hints per class — get_type_hints is expensive.
+
+    When the class's own annotations are already concrete types (no string
+    forward refs) and no base class contributes annotations, reading
+    __annotations__ directly is ~100x cheaper than get_type_hints.
+    """
+    own = cls.__dict__.get("__annotations__", {})
+    if own and not any(isinstance(v, str) for v in own.values()):
+        inherited = any(
+            base.__dict__.get("__annotations__") for base in cls.__mro__[1:]
+        )
+        if not inherited:
+            return own
+
+    try:
+        return get_type_hints(cls)
+    except Exception:
+        return {}
+
+
+@lru_cache(maxsize=None)
+def _cached_fields(cls):
+    """Cache the fields tuple per class — dataclasses.fields rebuilds it each call."""
+    return fields(cls)
+
+
+def _is_union_type(t) -> bool:
+    o = get_origin(t)
+    _union_types = (Union,)
+    if hasattr(types, "UnionType"):
+        _union_types = (Union, types.UnionType)
+    return o in _union_types
+
+
+def _strip_none_from_union(t):
+    if not _is_union_type(t):
+        return t
+    args = [a for a in get_args(t) if a is not type(None)]
+    return args[0] if len(args) == 1 else t
+
+
+def _identity(value):
+    return value
+
+
+def _coerce_dataclass(t):
+    def coerce(value):
+        # JSON-decoded payloads hold exact dicts — type-is beats isinstance here
+        if type(value) is dict:
+            return t.from_dict(value)
+        return value
+
+    return coerce
+
+
+def _coerce_list_of_dataclass(item_t):
+    def coerce(value):
+        return [
+            item_t.from_dict(v) if type(v) is dict else v
+            for v in (value or [])
+        ]
+
+    return coerce
+
+
+def _field_coercer(hint):
+    """Inspect a resolved type hint once and return a specialized coercer."""
+    optional = _is_union_type(hint) and type(None) in get_args(hint)
+    t = _strip_none_from_union(hint)
+    origin = get_origin(t)
+    args = get_args(t)
+
+    inner = _identity
+    if origin is list and args:
+        item_t = _strip_none_from_union(args[0])
+        if is_dataclass(item_t):
+            inner = _coerce_list_of_dataclass(item_t)
+    elif is_dataclass(t):
+        inner = _coerce_dataclass(t)
+
+    if inner is _identity:
+        return _identity
+    if not optional:
+        return inner
+
+    def coerce_optional(value):
+        if value is None:
+            return None
+        return inner(value)
+
+    return coerce_optional
+
+
+@lru_cache(maxsize=None)
+def _coercion_plan(cls):
+    """Precompute (field_name, coercer) pairs so from_dict is a flat loop."""
+    resolved_hints = _cached_type_hints(cls)
+    return tuple(
+        (f.name, _field_coercer(resolved_hints.get(f.name, f.type)))
+        for f in _cached_fields(cls)
+    )
+
+
+@lru_cache(maxsize=None)
+def _from_dict_fast(cls):
+    """Generate a straight-line from_dict function for cls via exec.
+
+    The emitted function has one `if 'name' in data:` line per field with the
+    specialized coercer bound as a default argument (fastest local lookup),
+    eliminating the Python-level loop over the coercion plan.
+    """
+    plan = _coercion_plan(cls)
+    lines = ["def _fd(data, _cls=_cls"]
+    body = ["    k = {}"]
+    for i, (name, coerce) in enumerate(plan):
+        lines.append(f", _c{i}=_c{i}")
+        if coerce is _identity:
+            body.append(f"    if {name!r} in data: k[{name!r}] = data[{name!r}]")
+        else:
+            body.append(f"    if {name!r} in data: k[{name!r}] = _c{i}(data[{name!r}])")
+    lines.append("):")
+    body.append("    return _cls(**k)")
+    source = "".join(lines) + "\n" + "\n".join(body)
+
+    namespace = {"_cls": cls}
+    namespace.update({f"_c{i}": coerce for i, (_, coerce) in enumerate(plan)})
+    exec(source, namespace)
+    return namespace["_fd"]
+
+
+@lru_cache(maxsize=None)
+def _to_dict_fast(cls):
+    """Generate a straight-line to_dict for cls that knows statically which
+    fields are scalar, nested dataclass, or list-of-dataclass.
+
+    Returns None for classes with an `Any`-typed field, where the value's
+    structure can't be known statically — those use the generic loop.
+    """
+    resolved_hints = _cached_type_hints(cls)
+    parts = []
+    all_scalar = True
+    for f in _cached_fields(cls):
+        hint = resolved_hints.get(f.name, f.type)
+        t = _strip_none_from_union(hint)
+        if t is Any:
+            return None
+        origin = get_origin(t)
+        args = get_args(t)
+        if origin is list and args and is_dataclass(_strip_none_from_union(args[0])):
+            parts.append(f"{f.name!r}: [v.to_dict() for v in self.{f.name}]")
+            all_scalar = False
+        elif is_dataclass(t):
+            parts.append(
+                f"{f.name!r}: self.{f.name}.to_dict() if self.{f.name} is not None else None"
+            )
+            all_scalar = False
+        else:
+            parts.append(f"{f.name!r}: self.{f.name}")
+
+    if all_scalar:
+        # Pure scalar container — pull every field in one C-level attrgetter
+        # call instead of a generated dict literal
+        names = tuple(f.name for f in _cached_fields(cls))
+        if len(names) == 1:
+            name = names[0]
+            get_one = attrgetter(name)
+            return lambda self: {name: get_one(self)}
+        get_all = attrgetter(*names)
+
+        def _td(self, _names=names, _get=get_all):
+            return dict(zip(_names, _get(self)))
+
+        return _td
+
+    source = "def _td(self):\n    return {" + ", ".join(parts) + "}"
+    namespace = {}
+    exec(source, namespace)
+    return namespace["_td"]
+
+
+# All DataclassBase subclasses, registered at class-creation time so to_dict
+# can dispatch with an O(1) set lookup instead of an O(MRO) hasattr check
+_DC_TYPES = set()
+
+# slots=True shrinks instances and speeds attribute access, but the kwarg
+# only exists on Python 3.10+ — on the documented 3.9 floor the models fall
+# back to plain dataclasses
+_model_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+def _orjson_default(obj):
+    if type(obj) in _DC_TYPES or hasattr(type(obj), "__dataclass_fields__"):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 
 class DataclassBase:
     """Base class providing from_dict and to_dict methods for dataclasses."""
 
+    # Empty slots so slotted subclasses don't inherit a __dict__ from here
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _DC_TYPES.add(cls)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
-        def _is_union_type(t) -> bool:
-            o = get_origin(t)
-            _union_types = (Union,)
-            if hasattr(types, "UnionType"):
-                _union_types = (Union, types.UnionType)
-            return o in _union_types
-
-        def _strip_none_from_union(t):
-            if not _is_union_type(t):
-                return t
-            args = [a for a in get_args(t) if a is not type(None)]
-            return args[0] if len(args) == 1 else t
-
-        def _coerce(value, t):
-            if value is None and _is_union_type(t) and type(None) in get_args(t):
-                return None
-            t = _strip_none_from_union(t)
-            origin = get_origin(t)
-            args = get_args(t)
-
-            if origin is list and args:
-                item_t = _strip_none_from_union(args[0])
-                if is_dataclass(item_t):
-                    return [
-                        item_t.from_dict(v) if isinstance(v, dict) else v
-                        for v in (value or [])
-                    ]
-                return value
-
-            if is_dataclass(t) and isinstance(value, dict):
-                return t.from_dict(value)
-
-            return value
-
-        try:
-            resolved_hints = get_type_hints(cls)
-        except Exception:
-            resolved_hints = {}
-
-        kwargs = {}
-        for f in fields(cls):
-            if f.name in data:
-                hint = resolved_hints.get(f.name, f.type)
-                kwargs[f.name] = _coerce(data[f.name], hint)
-
-        return cls(**kwargs)
+        return _from_dict_fast(cls)(data)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert instance to dictionary, handling nested dataclasses."""
+        fast = _to_dict_fast(type(self))
+        if fast is not None:
+            return fast(self)
+
         result = {}
-        for f in fields(self):
+        for f in _cached_fields(type(self)):
             value = getattr(self, f.name)
 
-            if hasattr(value, "__dataclass_fields__"):
+            if type(value) in _DC_TYPES:
                 result[f.name] = value.to_dict()
             elif (
-                isinstance(value, list)
+                type(value) is list
                 and value
-                and hasattr(value[0], "__dataclass_fields__")
+                and type(value[0]) in _DC_TYPES
             ):
                 result[f.name] = [item.to_dict() for item in value]
             else:
@@ -84,12 +256,25 @@ class DataclassBase:
 
         return result
 
-    def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+    if orjson is not None:
 
-    @classmethod
-    def from_json(cls, json_str: str):
-        return cls.from_dict(json.loads(json_str))
+        def to_json(self) -> str:
+            # default= lets orjson serialize nested dataclasses it encounters
+            # in untyped fields without a Python-level to_dict walk
+            return orjson.dumps(self.to_dict(), default=_orjson_default).decode()
+
+        @classmethod
+        def from_json(cls, json_str: str):
+            return cls.from_dict(orjson.loads(json_str))
+
+    else:
+
+        def to_json(self) -> str:
+            return json.dumps(self.to_dict())
+
+        @classmethod
+        def from_json(cls, json_str: str):
+            return cls.from_dict(json.loads(json_str))
 
 
 # ---------------------------------------------------------------------------
@@ -97,7 +282,7 @@ class DataclassBase:
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@_model_dataclass
 class ScraperAction(DataclassBase):
     """A single action decided by the AI for the web scraper."""
 
@@ -111,7 +296,7 @@ class ScraperAction(DataclassBase):
     reason: Optional[str] = None
 
 
-@dataclass
+@_model_dataclass
 class ScraperStep(DataclassBase):
     """A recorded step in a scrape session: the action taken plus context."""
 
@@ -126,7 +311,7 @@ class ScraperStep(DataclassBase):
     error: Optional[str] = None
 
 
-@dataclass
+@_model_dataclass
 class DiscoveredApi(DataclassBase):
     """An API endpoint discovered from network traffic during a scrape."""
 
@@ -143,7 +328,7 @@ class DiscoveredApi(DataclassBase):
     notes: Optional[str] = None
 
 
-@dataclass
+@_model_dataclass
 class ScrapeResult(DataclassBase):
     """Final result of an AI-powered scrape session."""
 
@@ -155,12 +340,34 @@ class ScrapeResult(DataclassBase):
     discovered_apis: List[DiscoveredApi] = field(default_factory=list)
 
 
+@_model_dataclass
+class NetworkTraffic(DataclassBase):
+    """Columnar (struct-of-arrays) view of captured network traffic.
+
+    One index per request; entry i of every list describes the same request.
+    statuses[i] is -1 when no response was captured. The hot filtering loops
+    in API discovery scan these flat columns instead of a list of dicts.
+    """
+
+    request_ids: List[str] = field(default_factory=list)
+    urls: List[str] = field(default_factory=list)
+    methods: List[str] = field(default_factory=list)
+    resource_types: List[str] = field(default_factory=list)
+    statuses: List[int] = field(default_factory=list)
+    mime_types: List[str] = field(default_factory=list)
+    request_headers: List[Dict[str, str]] = field(default_factory=list)
+    post_data: List[Optional[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+
 # ---------------------------------------------------------------------------
 # Smart Crawler / Recipe models
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@_model_dataclass
 class RecipeStep(DataclassBase):
     """A single deterministic step in a crawler recipe."""
 
@@ -176,7 +383,7 @@ class RecipeStep(DataclassBase):
     wait_after: float = 1.0  # seconds to wait after executing this step
 
 
-@dataclass
+@_model_dataclass
 class CrawlerRecipe(DataclassBase):
     """A deterministic recipe generated from an AI-guided crawl session."""
 
@@ -194,7 +401,7 @@ class CrawlerRecipe(DataclassBase):
     version: int = 1
 
 
-@dataclass
+@_model_dataclass
 class SmartCrawlResult(DataclassBase):
     """Result from a SmartCrawler run."""
 
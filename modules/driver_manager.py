@@ -18,53 +18,141 @@ Usage:
 """
 
 from datetime import datetime
+from functools import lru_cache
+from html import escape
 import json
 import os
 import time
 import urllib
-import urllib3
-import certifi
-import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
+import lxml.html
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchElementException,
+    TimeoutException,
+)
 from selenium.webdriver.support.ui import Select
 
+# Heavy dependencies (undetected_chromedriver, bs4, urllib3, certifi) are
+# imported lazily inside the functions that need them — they add hundreds of
+# ms to module load and many code paths never touch them.
 
-# Patch undetected_chromedriver to prevent __del__ errors
-def patched_del(self):
-    pass
 
+@lru_cache(maxsize=None)
+def _uc():
+    """Import undetected_chromedriver on first use and apply the __del__ patch."""
+    import undetected_chromedriver as uc
 
-uc.Chrome.__del__ = patched_del
+    # Patch undetected_chromedriver to prevent __del__ errors
+    uc.Chrome.__del__ = lambda self: None
+    return uc
 
 
 def loadSoup(path):
-    soup = BeautifulSoup(open(path), "html5lib")
+    from bs4 import BeautifulSoup
+
+    with open(path) as f:
+        soup = BeautifulSoup(f, "html5lib")
     return soup
 
 
+def loadTree(path):
+    return lxml.html.parse(path).getroot()
+
+
 def saveImage(url, save_path):
     urllib.request.urlretrieve(url, save_path)
 
 
+_POOL = None
+
+
+def _pool():
+    """Shared PoolManager — avoids re-reading the CA bundle per request and
+    enables connection keep-alive across calls."""
+    global _POOL
+    if _POOL is None:
+        import urllib3
+        import certifi
+
+        _POOL = urllib3.PoolManager(cert_reqs="CERT_REQUIRED", ca_certs=certifi.where())
+    return _POOL
+
+
 def getSoup(url):
-    http = urllib3.PoolManager(cert_reqs="CERT_REQUIRED", ca_certs=certifi.where())
-    response = http.request("GET", url)
+    from bs4 import BeautifulSoup
+
+    response = _pool().request("GET", url)
     soup = BeautifulSoup(response.data, "html5lib")
     return soup
 
 
+def getTree(url):
+    response = _pool().request("GET", url)
+    return lxml.html.fromstring(response.data)
+
+
 def writeSoup(soup, out_path="./out.txt"):
-    out = open(out_path, "w")
-    for char in soup.prettify():
-        try:
-            out.write(char)
-        except:
-            continue
+    # errors="replace" handles unencodable chars at the C level — no need for
+    # the old per-character write loop
+    with open(out_path, "w", encoding="utf-8", errors="replace") as out:
+        out.write(soup.prettify())
+
+
+@lru_cache(maxsize=None)
+def _standard_chrome_spec(view, headless):
+    """Build the standard-Chrome argument spec once per (view, headless).
+
+    refresh() is called on every retry in get() and on set_view, so cache the
+    argument list rather than re-deriving it each time.
+    """
+    args = [
+        "--disable-extensions",
+        "--disable-web-security",
+        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/92.0.4515.159 Safari/537.36",
+        "--disable-gpu",
+        "enable-automation",
+        "--no-sandbox",
+        "--disable-infobars",
+        "--disable-dev-shm-usage",
+        "--disable-browser-side-navigation",
+    ]
+    experimental = []
+
+    if headless:
+        args.append("--headless")
+        args.append("--autoplay-policy=no-user-gesture-required")
+        experimental.append(("excludeSwitches", ["--mute-audio"]))
+
+    if view == "mobile":
+        experimental.append(("mobileEmulation", {"deviceName": "iPhone X"}))
+        args.append("--disable-notifications")
+    elif view == "desktop":
+        args.append("--start-maximized")
+        args.append("--disable-notifications")
+        experimental.append((
+            "excludeSwitches",
+            [
+                "ignore-certificate-errors",
+                "safebrowsing-disable-download-protection",
+                "safebrowsing-disable-auto-update",
+                "disable-client-side-phishing-detection",
+            ],
+        ))
+
+    return tuple(args), tuple(experimental)
 
 
 class DriverManager:
@@ -93,7 +181,8 @@ class DriverManager:
         return self.driver.current_url
 
     def tap(self, element):
-        self.touch = webdriver.TouchActions(self.driver)
+        if getattr(self, "touch", None) is None:
+            self.touch = webdriver.TouchActions(self.driver)
         self.touch.tap(element).perform()
 
     def switch_to_iframe(self, iframe):
@@ -112,7 +201,13 @@ class DriverManager:
             return
 
     def move_to_element(self, element):
-        actions = ActionChains(self.driver)
+        # Reuse one ActionChains per driver — constructing a fresh command
+        # queue per call adds up on mouse-heavy interactions
+        actions = getattr(self, "_actions", None)
+        if actions is None:
+            actions = self._actions = ActionChains(self.driver)
+        else:
+            actions.reset_actions()
         actions.move_to_element(element).perform()
 
     def next_sibling(self, element):
@@ -121,41 +216,50 @@ class DriverManager:
         )
 
     def nth_sibling(self, element, n):
-        for _ in range(n):
-            element = self.next_sibling(element)
-        return element
+        # Walk all n siblings in one script call instead of n round-trips
+        return self.driver.execute_script(
+            "var e = arguments[0];"
+            "for (var i = 0; i < arguments[1]; i++) {"
+            "  e = e.nextElementSibling;"
+            "  if (!e) return null;"
+            "}"
+            "return e;",
+            element,
+            n,
+        )
 
     def wait_on_element_load(self, xpath, timeout=10):
-        found = False
-        start_time = datetime.now()
-        while not found:
-            if (datetime.now() - start_time).seconds > timeout:
-                return
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while time.monotonic() < deadline:
             try:
                 self.driver.find_element(By.XPATH, xpath)
-                found = True
+                return
             except NoSuchElementException:
-                continue
+                pass
+            # Back off between polls instead of hammering the driver
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
 
     def wait_on_elements_load(self, xpaths, timeout=10):
-        found = False
-        start_time = datetime.now()
-        while not found:
-            if (datetime.now() - start_time).seconds > timeout:
-                return
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while time.monotonic() < deadline:
             for xpath in xpaths:
                 try:
                     self.driver.find_element(By.XPATH, xpath)
-                    found = True
-                    break
+                    return
                 except NoSuchElementException:
                     continue
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
 
     def scroll(self, amount):
-        self.driver.execute_script("window.scrollTo(0, {});".format(amount))
+        # Constant script + arguments lets the browser cache the compiled JS
+        self.driver.execute_script("window.scrollTo(0, arguments[0]);", amount)
 
     def scroll_by(self, amount):
-        self.driver.execute_script("window.scrollBy(0, {});".format(amount), "")
+        self.driver.execute_script("window.scrollBy(0, arguments[0]);", amount)
 
     def scroll_to_view(self, element):
         self.driver.execute_script(
@@ -175,16 +279,19 @@ class DriverManager:
             target: The postback target (e.g., 'm_DisplayCore')
             argument: The postback argument (e.g., 'DisplayInternalAction|TabSwitch|98|PARCELMAP')
         """
-        script = f"""
-        setTimeout(function() {{
-            try {{
-                __doPostBack('{target}', '{argument}');
-            }} catch(e) {{
+        # Pass target/argument as script arguments — avoids re-parsing a
+        # unique script per call and JS injection via quotes in the values
+        script = """
+        var target = arguments[0], argument = arguments[1];
+        setTimeout(function() {
+            try {
+                __doPostBack(target, argument);
+            } catch(e) {
                 console.error('Postback error:', e);
-            }}
-        }}, 10);
+            }
+        }, 10);
         """
-        self.driver.execute_script(script)
+        self.driver.execute_script(script, target, argument)
 
     def enable_network_logging(self):
         self.driver.execute_cdp_cmd("Network.enable", {})
@@ -194,10 +301,17 @@ class DriverManager:
         try:
             logs = self.driver.get_log("performance")
             requests = {}
-            responses = {}
 
             for entry in logs:
-                message = json.loads(entry["message"])["message"]
+                # Most log entries are other CDP events — reject them with a
+                # raw substring scan before paying for a JSON parse
+                msg = entry["message"]
+                if (
+                    '"Network.requestWillBeSent"' not in msg
+                    and '"Network.responseReceived"' not in msg
+                ):
+                    continue
+                message = _json_loads(msg)["message"]
                 method = message["method"]
                 params = message.get("params", {})
 
@@ -212,27 +326,72 @@ class DriverManager:
                         "postData": req.get("postData"),
                         "resourceType": params.get("type", ""),
                         "timestamp": entry["timestamp"],
+                        "response": None,
                     }
 
                 elif method == "Network.responseReceived":
                     req_id = params.get("requestId")
-                    resp = params.get("response", {})
-                    responses[req_id] = {
-                        "status": resp.get("status"),
-                        "mimeType": resp.get("mimeType", ""),
-                        "headers": resp.get("headers", {}),
-                    }
-
-            # Merge requests with their responses
-            traffic = []
-            for req_id, req_data in requests.items():
-                req_data["response"] = responses.get(req_id)
-                traffic.append(req_data)
+                    req_data = requests.get(req_id)
+                    if req_data is not None:
+                        resp = params.get("response", {})
+                        req_data["response"] = {
+                            "status": resp.get("status"),
+                            "mimeType": resp.get("mimeType", ""),
+                            "headers": resp.get("headers", {}),
+                        }
 
-            return traffic
+            return list(requests.values())
         except Exception:
             return []
 
+    def get_network_traffic_columns(self):
+        """Get captured traffic as parallel columns (see models.NetworkTraffic).
+
+        Same data as get_network_traffic but laid out struct-of-arrays, so
+        bulk filters iterate flat lists instead of chasing per-entry dicts.
+        """
+        from models import NetworkTraffic
+
+        t = NetworkTraffic()
+        try:
+            logs = self.driver.get_log("performance")
+            index = {}
+
+            for entry in logs:
+                msg = entry["message"]
+                if (
+                    '"Network.requestWillBeSent"' not in msg
+                    and '"Network.responseReceived"' not in msg
+                ):
+                    continue
+                message = _json_loads(msg)["message"]
+                method = message["method"]
+                params = message.get("params", {})
+
+                if method == "Network.requestWillBeSent":
+                    req_id = params.get("requestId")
+                    req = params.get("request", {})
+                    index[req_id] = len(t.urls)
+                    t.request_ids.append(req_id)
+                    t.urls.append(req.get("url", ""))
+                    t.methods.append(req.get("method", ""))
+                    t.resource_types.append(params.get("type", ""))
+                    t.statuses.append(-1)
+                    t.mime_types.append("")
+                    t.request_headers.append(req.get("headers", {}))
+                    t.post_data.append(req.get("postData"))
+
+                elif method == "Network.responseReceived":
+                    i = index.get(params.get("requestId"))
+                    if i is not None:
+                        resp = params.get("response", {})
+                        t.statuses[i] = resp.get("status", -1)
+                        t.mime_types[i] = resp.get("mimeType", "")
+
+            return t
+        except Exception:
+            return NetworkTraffic()
+
     def get_response_body(self, request_id):
         """Get the response body for a specific request ID."""
         try:
@@ -243,6 +402,20 @@ class DriverManager:
         except Exception:
             return None
 
+    def get_response_bodies(self, request_ids):
+        """Get response bodies for several request IDs as a dict.
+
+        The per-request CDP round-trips are issued across a small thread
+        pool so their wire latency overlaps instead of accumulating.
+        """
+        if not request_ids:
+            return {}
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(8, len(request_ids))) as ex:
+            bodies = list(ex.map(self.get_response_body, request_ids))
+        return dict(zip(request_ids, bodies))
+
     def get_browser_cookies(self):
         """Get all browser cookies as a dict (name -> value)."""
         try:
@@ -251,60 +424,65 @@ class DriverManager:
         except Exception:
             return {}
 
-    def get_network_requests(self, only_xhr=False):
-        try:
-            logs = self.driver.get_log("performance")
-            requests = []
+    def _iter_requests(self, only_xhr=False, url_partial=None, method=None):
+        """Yield captured requests, filtering inline during the parse pass."""
+        logs = self.driver.get_log("performance")
+        url_partial = url_partial.lower() if url_partial else None
+        method = method.upper() if method else None
 
-            for entry in logs:
-                message = json.loads(entry["message"])["message"]
-                if message["method"] == "Network.requestWillBeSent":
-                    req = message["params"]["request"]
-
-                    if only_xhr:
-                        accept_header = req.get("headers", {}).get("Accept", "")
-                        if (
-                            "application/json" not in accept_header
-                            and "text/html" not in accept_header
-                        ):
-                            continue
-
-                    requests.append(
-                        {
-                            "url": req["url"],
-                            "method": req["method"],
-                            "headers": req.get("headers"),
-                            "postData": req.get("postData"),
-                            "timestamp": entry["timestamp"],
-                        }
-                    )
+        for entry in logs:
+            msg = entry["message"]
+            if '"Network.requestWillBeSent"' not in msg:
+                continue
+            message = _json_loads(msg)["message"]
+            if message["method"] != "Network.requestWillBeSent":
+                continue
+            req = message["params"]["request"]
+
+            if only_xhr:
+                accept_header = req.get("headers", {}).get("Accept", "")
+                if (
+                    "application/json" not in accept_header
+                    and "text/html" not in accept_header
+                ):
+                    continue
+
+            if url_partial and url_partial not in req["url"].lower():
+                continue
+            if method and req["method"].upper() != method:
+                continue
+
+            yield {
+                "url": req["url"],
+                "method": req["method"],
+                "headers": req.get("headers"),
+                "postData": req.get("postData"),
+                "timestamp": entry["timestamp"],
+            }
 
-            return requests
+    def get_network_requests(self, only_xhr=False):
+        try:
+            return list(self._iter_requests(only_xhr=only_xhr))
         except Exception:
             return []
 
     def get_network_requests_by_url(self, url_partial, only_xhr=False):
         try:
-            all_requests = self.get_network_requests(only_xhr=only_xhr)
-            return [r for r in all_requests if url_partial.lower() in r["url"].lower()]
+            return list(self._iter_requests(only_xhr=only_xhr, url_partial=url_partial))
         except Exception:
             return []
 
     def get_network_requests_by_method(self, method, only_xhr=False):
         try:
-            all_requests = self.get_network_requests(only_xhr=only_xhr)
-            return [r for r in all_requests if r["method"].upper() == method.upper()]
+            return list(self._iter_requests(only_xhr=only_xhr, method=method))
         except Exception:
             return []
 
     def get_network_requests_by_url_and_method(self, url_partial, method, only_xhr=False):
         try:
-            all_requests = self.get_network_requests(only_xhr=only_xhr)
-            return [
-                r for r in all_requests
-                if url_partial.lower() in r["url"].lower()
-                and r["method"].upper() == method.upper()
-            ]
+            return list(
+                self._iter_requests(only_xhr=only_xhr, url_partial=url_partial, method=method)
+            )
         except Exception:
             return []
 
@@ -315,6 +493,7 @@ class DriverManager:
             pass
 
     def start_undetected_chromedriver(self):
+        uc = _uc()
         options = uc.ChromeOptions()
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-blink-features=AutomationControlled")
@@ -332,55 +511,30 @@ class DriverManager:
 
         # Match installed Chrome major version to avoid SessionNotCreatedException
         self.driver = uc.Chrome(options=options, version_main=self.chrome_version_main)
+        self.driver.set_page_load_timeout(30)
 
     def refresh(self):
         self.close()
+        # Cached action builders are bound to the old driver
+        self._actions = None
+        self.touch = None
 
         if self.undetected:
             self.start_undetected_chromedriver()
             return
 
+        # ChromeOptions aren't reusable across driver starts, so replay the
+        # cached argument spec into a fresh object each time
+        args, experimental = _standard_chrome_spec(self.view, self.headless)
         options = webdriver.ChromeOptions()
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-web-security")
-
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/92.0.4515.159 Safari/537.36"
-        )
-        options.add_argument(f"user-agent={user_agent}")
-        options.add_argument("--disable-gpu")
-        options.add_argument("enable-automation")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-browser-side-navigation")
+        for arg in args:
+            options.add_argument(arg)
+        for name, value in experimental:
+            options.add_experimental_option(name, value)
         options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
-        if self.headless:
-            options.add_argument("--headless")
-            options.add_argument("--autoplay-policy=no-user-gesture-required")
-            options.add_experimental_option("excludeSwitches", ["--mute-audio"])
-
-        if self.view == "mobile":
-            mobile_emulation = {"deviceName": "iPhone X"}
-            options.add_experimental_option("mobileEmulation", mobile_emulation)
-            options.add_argument("--disable-notifications")
-        elif self.view == "desktop":
-            options.add_argument("--start-maximized")
-            options.add_argument("--disable-notifications")
-            options.add_experimental_option(
-                "excludeSwitches",
-                [
-                    "ignore-certificate-errors",
-                    "safebrowsing-disable-download-protection",
-                    "safebrowsing-disable-auto-update",
-                    "disable-client-side-phishing-detection",
-                ],
-            )
-
         self.driver = webdriver.Chrome(options=options)
+        self.driver.set_page_load_timeout(30)
 
     def set_view(self, view):
         if self.view != view:
@@ -407,33 +561,82 @@ class DriverManager:
             try:
                 self.driver.get(url)
                 break
+            except TimeoutException:
+                # Slow page load — stop it and retry without the multi-second
+                # cost of tearing down and re-spawning Chrome
+                try:
+                    self.driver.execute_script("window.stop();")
+                except Exception:
+                    pass
+                refreshes += 1
+            except InvalidSessionIdException:
+                # Session died — only this case needs a full restart
+                self.refresh()
+                refreshes += 1
             except Exception:
                 self.refresh()
                 refreshes += 1
 
     def get_soup(self):
+        from bs4 import BeautifulSoup
+
         body = self.driver.find_element(By.TAG_NAME, "body")
         return BeautifulSoup(body.get_attribute("outerHTML"), "lxml")
 
+    def get_tree(self):
+        """Get the page as a raw lxml tree — skips the BS4 wrapper layer,
+        which costs 2-5x parse time on large pages."""
+        return lxml.html.fromstring(self.get_page_source())
+
     def get_element_html(self, element):
         return element.get_attribute("outerHTML")
 
     def get_page_source(self):
         return self.driver.execute_script("return document.documentElement.outerHTML;")
 
+    # Markup the AI summary never reads — removed in-browser before the
+    # HTML crosses the wire (see get_page_source_for_ai)
+    _AI_SOURCE_EXPRESSION = """
+(() => {
+  const body = document.body ? document.body.cloneNode(true) : null;
+  if (!body) return {t: document.title, b: ""};
+  body.querySelectorAll("script,style,noscript,svg,template").forEach(e => e.remove());
+  return {t: document.title, b: body.outerHTML};
+})()
+""".strip()
+
+    def get_page_source_for_ai(self):
+        """Page HTML with scripts/styles already dropped in the browser.
+
+        document.documentElement.outerHTML ships every inline script and
+        style bundle across the driver IPC boundary only for the cleaner to
+        throw them away; a CDP Runtime.evaluate on a pruned body clone moves
+        a fraction of the bytes. Falls back to get_page_source() when CDP
+        isn't available.
+        """
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Runtime.evaluate",
+                {"expression": self._AI_SOURCE_EXPRESSION, "returnByValue": True},
+            )["result"]["value"]
+        except Exception:
+            return self.get_page_source()
+        title = escape(result.get("t") or "")
+        return f"<html><head><title>{title}</title></head>{result.get('b') or ''}</html>"
+
     def store_soup(self):
-        with open("./soup.txt", "w") as out:
-            soup = BeautifulSoup(
-                self.driver.find_element(By.TAG_NAME, "body").get_attribute("outerHTML"),
-                "lxml",
-            )
-            for char in soup.prettify():
-                try:
-                    out.write(char)
-                except Exception:
-                    pass
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(
+            self.driver.find_element(By.TAG_NAME, "body").get_attribute("outerHTML"),
+            "lxml",
+        )
+        with open("./soup.txt", "w", encoding="utf-8", errors="replace") as out:
+            out.write(soup.prettify())
 
     def load_soup(self):
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(open("./soup.txt"), "lxml")
         return soup
 
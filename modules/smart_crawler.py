@@ -13,6 +13,8 @@ for identical or similar goals on the same domain.
 
 from __future__ import annotations
 
+import collections
+import copy
 import hashlib
 import json
 import logging
@@ -23,12 +25,24 @@ import time
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-from selenium.common.exceptions import (
-    ElementClickInterceptedException,
-    NoSuchElementException,
-    StaleElementReferenceException,
-)
+# Selenium, BeautifulSoup/lxml, and the browser/AI modules are imported
+# lazily inside the methods that use them — the --list-recipes and
+# --delete-recipe CLI paths never touch a browser and shouldn't pay
+# hundreds of ms of import time for one.
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import (
@@ -39,13 +53,91 @@ from models import (
     ScraperStep,
     SmartCrawlResult,
 )
-from modules.web_scraper import WebScraper, clean_html_for_ai, call_claude_cli, analyze_network_for_apis
-from modules.driver_manager import DriverManager
 
 logger = logging.getLogger(__name__)
 
 RECIPES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "recipes")
 
+# Above this size, map the file instead of copying it into a bytes object —
+# the JSON parser can scan the mapped region directly
+_MMAP_THRESHOLD = 64 * 1024
+
+
+# Shared background executor for work that can overlap driver round-trips
+# (e.g. API discovery during final extraction). Created on first use so the
+# recipe-management CLI paths never spawn threads.
+_EXECUTOR = None
+
+
+def _background_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="smart-crawler")
+    return _EXECUTOR
+
+
+_VAR_RE = re.compile(r"\{(\w+)\}")
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _parse_ai_json(text: str) -> Optional[dict]:
+    """Extract and parse the JSON object from an AI response.
+
+    Handles responses that wrap the JSON in markdown code fences, and falls
+    back to grabbing the first balanced brace-delimited region.
+    """
+    # web_scraper is already loaded here: this only runs on responses from
+    # call_claude_cli, which is imported from it
+    from modules.web_scraper import _find_json_object
+
+    fence_match = _FENCED_JSON_RE.search(text)
+    if fence_match:
+        text = fence_match.group(1)
+
+    try:
+        return _json_loads(text)
+    except ValueError:
+        candidate = _find_json_object(text)
+        if candidate:
+            try:
+                return _json_loads(candidate)
+            except ValueError:
+                pass
+    return None
+
+
+def _subst(s: str, variables: Dict[str, str]) -> str:
+    """Substitute {variable} placeholders in one pass over the string."""
+    if not s or not variables or _VAR_RE.search(s) is None:
+        return s
+    return _VAR_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), s)
+
+
+def _compile_template(tmpl: Optional[str], variables: Dict[str, str]):
+    """Partially evaluate a {variable} template against a known variables dict.
+
+    The variables are fixed for the whole recipe run, so the substitution is
+    done once here; the returned zero-arg closure just hands back the
+    finished string — no regex work in the step loop.
+    """
+    if not tmpl:
+        return lambda: tmpl or ""
+    resolved = _subst(tmpl, variables)
+    return lambda: resolved
+
+
+def _read_file_bytes(path: str):
+    """Read a file as one contiguous buffer for the JSON parser."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            import mmap
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return bytes(buf)
+        return f.read()
+
 RECIPE_GEN_PROMPT = """\
 You are a recipe generator. Given a successful web crawl session (goal + steps taken),
 generate a deterministic recipe that can replicate the same crawl WITHOUT AI.
@@ -87,6 +179,13 @@ Respond with ONLY the JSON recipe, no markdown or explanation.
 class SmartCrawler:
     """Self-learning crawler: AI-guided first run, deterministic recipe thereafter."""
 
+    # In-process recipe cache: recipe_id -> (mtime, CrawlerRecipe). Shared
+    # across instances so long-running services don't re-parse per crawl.
+    _recipe_cache: "collections.OrderedDict[str, tuple[float, CrawlerRecipe]]" = (
+        collections.OrderedDict()
+    )
+    _recipe_cache_size = 128
+
     def __init__(
         self,
         headless: bool = True,
@@ -98,6 +197,31 @@ class SmartCrawler:
         self.max_steps = max_steps
         self.dm: Optional[DriverManager] = None
         self.steps: list[ScraperStep] = []
+        # Last cleaned page context, keyed by HTML hash — avoids re-running
+        # clean_html_for_ai when the DOM is unchanged between AI steps
+        self._ctx_cache: tuple = (None, None)
+
+        # Dispatch tables: one hash lookup per step instead of an elif chain
+        self._recipe_dispatch = {
+            "goto": self._recipe_goto,
+            "click": self._recipe_click,
+            "type": self._recipe_type,
+            "scroll_down": self._recipe_scroll_down,
+            "scroll_up": self._recipe_scroll_up,
+            "wait": self._recipe_wait,
+            "extract": self._recipe_extract,
+        }
+        self._action_dispatch = {
+            "click": self._action_click,
+            "type": self._action_type,
+            "scroll_down": self._action_scroll_down,
+            "scroll_up": self._action_scroll_up,
+            "goto": self._action_goto,
+            "wait": self._action_wait,
+            "extract": self._action_noop,
+            "done": self._action_noop,
+            "fail": self._action_noop,
+        }
 
     # ------------------------------------------------------------------
     # Recipe management
@@ -105,7 +229,17 @@ class SmartCrawler:
 
     @staticmethod
     def _recipe_id(domain: str, goal: str) -> str:
-        """Generate a stable recipe ID from domain + goal."""
+        """Generate a stable recipe ID from domain + goal.
+
+        blake2b is 2-3x faster than sha256 on short inputs; the ID is only
+        used for file naming, so no security property is needed.
+        """
+        key = f"{domain}::{goal.lower().strip()}"
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    def _legacy_recipe_id(domain: str, goal: str) -> str:
+        """The old sha256-derived ID, kept for migrating on-disk recipes."""
         key = f"{domain}::{goal.lower().strip()}"
         return hashlib.sha256(key.encode()).hexdigest()[:16]
 
@@ -113,16 +247,79 @@ class SmartCrawler:
     def _recipe_path(recipe_id: str) -> str:
         return os.path.join(RECIPES_DIR, f"{recipe_id}.json")
 
+    @staticmethod
+    def _stats_path(recipe_id: str) -> str:
+        return os.path.join(RECIPES_DIR, f"{recipe_id}.stats.json")
+
+    def _merge_stats(self, recipe: CrawlerRecipe):
+        """Overlay usage counters from the sidecar stats file, if present."""
+        try:
+            stats = _json_loads(_read_file_bytes(self._stats_path(recipe.recipe_id)))
+        except (OSError, ValueError):
+            return
+        recipe.times_used = stats.get("times_used", recipe.times_used)
+        recipe.times_succeeded = stats.get("times_succeeded", recipe.times_succeeded)
+        recipe.last_used = stats.get("last_used", recipe.last_used)
+        recipe.ai_fallback_count = stats.get("ai_fallback_count", recipe.ai_fallback_count)
+
+    def _bump_stats(self, recipe: CrawlerRecipe, succeeded: bool, ai_fallback: bool = False):
+        """Record a recipe run by rewriting only the tiny stats sidecar.
+
+        The full recipe JSON stays untouched — re-serializing a multi-KB
+        recipe just to bump three counters was the bulk of per-run I/O.
+        """
+        recipe.times_used += 1
+        if succeeded:
+            recipe.times_succeeded += 1
+        if ai_fallback:
+            recipe.ai_fallback_count += 1
+        recipe.last_used = int(time.time())
+        try:
+            os.makedirs(RECIPES_DIR, exist_ok=True)
+            with open(self._stats_path(recipe.recipe_id), "wb") as f:
+                f.write(_json_dumps({
+                    "times_used": recipe.times_used,
+                    "times_succeeded": recipe.times_succeeded,
+                    "last_used": recipe.last_used,
+                    "ai_fallback_count": recipe.ai_fallback_count,
+                }))
+        except OSError as e:
+            logger.warning(f"Failed to write stats for {recipe.recipe_id}: {e}")
+
     def _load_recipe(self, domain: str, goal: str) -> Optional[CrawlerRecipe]:
         """Load an existing recipe for this domain+goal if one exists."""
         rid = self._recipe_id(domain, goal)
         path = self._recipe_path(rid)
         if not os.path.exists(path):
+            # One-time migration from the old sha256-derived filenames
+            legacy_path = self._recipe_path(self._legacy_recipe_id(domain, goal))
+            if not os.path.exists(legacy_path):
+                return None
+            os.replace(legacy_path, path)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
             return None
+
+        cached = self._recipe_cache.get(rid)
+        if cached is not None and cached[0] == mtime:
+            self._recipe_cache.move_to_end(rid)
+            # Deep-copy so in-run stat updates don't poison the cache
+            recipe = copy.deepcopy(cached[1])
+            self._merge_stats(recipe)
+            return recipe
+
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
+            data = _json_loads(_read_file_bytes(path))
             recipe = CrawlerRecipe.from_dict(data)
+            # Keep the stored ID in sync with the filename (migrated recipes
+            # still carry their old sha256-derived ID)
+            recipe.recipe_id = rid
+            self._recipe_cache[rid] = (mtime, copy.deepcopy(recipe))
+            self._recipe_cache.move_to_end(rid)
+            while len(self._recipe_cache) > self._recipe_cache_size:
+                self._recipe_cache.popitem(last=False)
+            self._merge_stats(recipe)
             logger.info(f"Loaded recipe {rid} (used {recipe.times_used}x, "
                         f"success rate {recipe.times_succeeded}/{recipe.times_used})")
             return recipe
@@ -131,11 +328,29 @@ class SmartCrawler:
             return None
 
     def _save_recipe(self, recipe: CrawlerRecipe):
-        """Save a recipe to disk."""
+        """Save a recipe to disk.
+
+        Encodes once to bytes and writes them in a single os.write to a temp
+        file, then os.replace — one syscall for the payload, and readers
+        never see a half-written recipe.
+        """
         os.makedirs(RECIPES_DIR, exist_ok=True)
         path = self._recipe_path(recipe.recipe_id)
-        with open(path, "w") as f:
-            json.dump(recipe.to_dict(), f, indent=2)
+        data = _json_dumps(recipe.to_dict())
+        tmp = path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+        # The full save embeds current counters — a stale sidecar would
+        # override them on the next load
+        try:
+            os.remove(self._stats_path(recipe.recipe_id))
+        except OSError:
+            pass
+        self._recipe_cache.pop(recipe.recipe_id, None)
         logger.info(f"Saved recipe {recipe.recipe_id} to {path}")
 
     # ------------------------------------------------------------------
@@ -145,6 +360,8 @@ class SmartCrawler:
     def _init_browser(self):
         if self.dm:
             return
+        from modules.driver_manager import DriverManager
+
         if self.headless:
             try:
                 logger.info("Starting undetected Chrome (headless)...")
@@ -179,6 +396,8 @@ class SmartCrawler:
     def _discover_apis(self) -> list:
         """Run network traffic analysis to find API endpoints."""
         try:
+            from modules.web_scraper import analyze_network_for_apis
+
             return analyze_network_for_apis(self.dm)
         except Exception as e:
             logger.warning(f"API discovery failed: {e}")
@@ -188,56 +407,110 @@ class SmartCrawler:
     # Deterministic recipe execution
     # ------------------------------------------------------------------
 
-    def _execute_recipe_step(self, step: RecipeStep, variables: Dict[str, str] = None) -> Optional[str]:
+    def _wait_after_step(self, step: RecipeStep, next_selector: Optional[str] = None):
+        """Wait after a step, returning as soon as the page is actually ready.
+
+        Waits for the next step's selector when known, otherwise for document
+        readyState — with step.wait_after as the upper bound instead of a
+        fixed sleep.
+        """
+        timeout = step.wait_after
+        if not timeout or timeout <= 0:
+            return
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            if next_selector:
+                WebDriverWait(self.dm.driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, next_selector))
+                )
+            else:
+                WebDriverWait(self.dm.driver, timeout).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+        except TimeoutException:
+            pass
+        except Exception:
+            time.sleep(timeout)
+
+    @staticmethod
+    def _step_selectors(step: RecipeStep) -> tuple:
+        """Precompute the non-empty (primary + fallback) selector tuple for a step."""
+        return tuple(
+            s for s in ((step.selector,) + tuple(step.fallback_selectors or ())) if s
+        )
+
+    # --- per-action recipe step handlers -------------------------------
+
+    def _recipe_goto(self, step, variables, next_selector, selectors, templates):
+        self.dm.get(templates[0]())
+        self._wait_after_step(step, next_selector)
+
+    def _recipe_click(self, step, variables, next_selector, selectors, templates):
+        element = self._find_with_fallbacks(selectors)
+        if not element:
+            return f"No element found for selector: {step.selector} (+ {len(step.fallback_selectors)} fallbacks)"
+        self.dm.scroll_to_view(element)
+        time.sleep(0.3)
+        element.click()
+        self._wait_after_step(step, next_selector)
+
+    def _recipe_type(self, step, variables, next_selector, selectors, templates):
+        element = self._find_with_fallbacks(selectors)
+        if not element:
+            return f"No element found for selector: {step.selector}"
+        self.dm.scroll_to_view(element)
+        element.clear()
+        element.send_keys(templates[1]())
+        self._wait_after_step(step, next_selector)
+
+    def _recipe_scroll_down(self, step, variables, next_selector, selectors, templates):
+        self.dm.scroll_by(600)
+        self._wait_after_step(step, next_selector)
+
+    def _recipe_scroll_up(self, step, variables, next_selector, selectors, templates):
+        self.dm.scroll_by(-600)
+        self._wait_after_step(step, next_selector)
+
+    def _recipe_wait(self, step, variables, next_selector, selectors, templates):
+        time.sleep(step.seconds or 2)
+
+    def _recipe_extract(self, step, variables, next_selector, selectors, templates):
+        pass  # Handled by caller using extract_fields
+
+    def _execute_recipe_step(
+        self,
+        step: RecipeStep,
+        variables: Dict[str, str] = None,
+        next_selector: Optional[str] = None,
+        selectors: Optional[tuple] = None,
+        templates: Optional[tuple] = None,
+    ) -> Optional[str]:
         """Execute a single recipe step. Returns error string or None."""
         variables = variables or {}
+        if selectors is None:
+            selectors = self._step_selectors(step)
+        if templates is None:
+            templates = (
+                _compile_template(step.url, variables),
+                _compile_template(step.text, variables),
+            )
 
-        try:
-            if step.action == "goto":
-                url = step.url or ""
-                for k, v in variables.items():
-                    url = url.replace(f"{{{k}}}", v)
-                self.dm.get(url)
-                time.sleep(step.wait_after)
-
-            elif step.action == "click":
-                element = self._find_with_fallbacks(step.selector, step.fallback_selectors)
-                if not element:
-                    return f"No element found for selector: {step.selector} (+ {len(step.fallback_selectors)} fallbacks)"
-                self.dm.scroll_to_view(element)
-                time.sleep(0.3)
-                element.click()
-                time.sleep(step.wait_after)
-
-            elif step.action == "type":
-                element = self._find_with_fallbacks(step.selector, step.fallback_selectors)
-                if not element:
-                    return f"No element found for selector: {step.selector}"
-                text = step.text or ""
-                for k, v in variables.items():
-                    text = text.replace(f"{{{k}}}", v)
-                self.dm.scroll_to_view(element)
-                element.clear()
-                element.send_keys(text)
-                time.sleep(step.wait_after)
-
-            elif step.action == "scroll_down":
-                self.dm.scroll_by(600)
-                time.sleep(step.wait_after)
-
-            elif step.action == "scroll_up":
-                self.dm.scroll_by(-600)
-                time.sleep(step.wait_after)
-
-            elif step.action == "wait":
-                time.sleep(step.seconds or 2)
-
-            elif step.action == "extract":
-                pass  # Handled by caller using extract_fields
+        handler = self._recipe_dispatch.get(step.action)
+        if handler is None:
+            return f"Unknown action: {step.action}"
 
-            else:
-                return f"Unknown action: {step.action}"
+        from selenium.common.exceptions import (
+            ElementClickInterceptedException,
+            NoSuchElementException,
+            StaleElementReferenceException,
+        )
 
+        try:
+            return handler(step, variables, next_selector, selectors, templates)
         except ElementClickInterceptedException as e:
             return f"Click intercepted: {e}"
         except StaleElementReferenceException:
@@ -247,14 +520,9 @@ class SmartCrawler:
         except Exception as e:
             return f"Action error: {e}"
 
-        return None
-
-    def _find_with_fallbacks(self, primary: str, fallbacks: List[str] = None):
-        """Try primary selector, then fallbacks. Returns element or None."""
-        selectors = [primary] + (fallbacks or [])
+    def _find_with_fallbacks(self, selectors):
+        """Try each selector in order. Returns element or None."""
         for sel in selectors:
-            if not sel:
-                continue
             try:
                 elements = self.dm.driver.find_elements("css selector", sel)
                 if elements:
@@ -263,8 +531,38 @@ class SmartCrawler:
                 continue
         return None
 
+    _BATCH_EXTRACT_JS = (
+        "const o = {};"
+        "for (const [k, s] of Object.entries(arguments[0])) {"
+        "  try {"
+        "    const e = document.querySelectorAll(s);"
+        "    o[k] = Array.from(e, x => x.innerText.trim());"
+        "  } catch (err) { o[k] = null; }"
+        "}"
+        "return o;"
+    )
+
     def _extract_data(self, extract_fields: Dict[str, str]) -> Dict[str, Any]:
-        """Extract data from the current page using CSS selectors."""
+        """Extract data from the current page using CSS selectors.
+
+        Runs all querySelectorAll calls in one execute_script round-trip;
+        falls back to per-field WebDriver lookups if the script fails.
+        """
+        try:
+            raw = self.dm.driver.execute_script(self._BATCH_EXTRACT_JS, extract_fields)
+            data = {}
+            for field_name in extract_fields:
+                vals = raw.get(field_name) if raw else None
+                if not vals:
+                    data[field_name] = None
+                elif len(vals) == 1:
+                    data[field_name] = vals[0]
+                else:
+                    data[field_name] = vals
+            return data
+        except Exception as e:
+            logger.warning(f"Batch extract failed, falling back to per-field: {e}")
+
         data = {}
         for field_name, selector in extract_fields.items():
             try:
@@ -289,15 +587,41 @@ class SmartCrawler:
 
         self._init_browser()
 
+        # Selector tuples and variable templates are fixed per recipe run —
+        # build them once, not per step (RecipeStep is slotted, so plans live
+        # in parallel lists rather than on the steps)
+        selector_plans = [self._step_selectors(step) for step in recipe.steps]
+        template_plans = [
+            (_compile_template(step.url, variables), _compile_template(step.text, variables))
+            for step in recipe.steps
+        ]
+
+        # Track the URL locally: it only changes on goto/click, so the other
+        # step types don't need a WebDriver round-trip just to record it
+        current_url = recipe.start_url
+
         try:
             for i, step in enumerate(recipe.steps, 1):
                 logger.info(f"  Recipe step {i}/{len(recipe.steps)}: {step.action} — {step.description}")
 
-                error = self._execute_recipe_step(step, variables)
+                # The next step's selector tells us what "ready" looks like
+                next_selector = recipe.steps[i].selector if i < len(recipe.steps) else None
+                error = self._execute_recipe_step(
+                    step, variables,
+                    next_selector=next_selector,
+                    selectors=selector_plans[i - 1],
+                    templates=template_plans[i - 1],
+                )
+
+                if not error:
+                    if step.action == "goto":
+                        current_url = template_plans[i - 1][0]()
+                    elif step.action == "click":
+                        current_url = self.dm.get_current_url()
 
                 self.steps.append(ScraperStep(
                     step=i,
-                    url=self.dm.get_current_url(),
+                    url=current_url,
                     action=step.action,
                     selector=step.selector,
                     text=step.text,
@@ -319,23 +643,30 @@ class SmartCrawler:
                             recipe_id=recipe.recipe_id,
                         )
 
-            # Final extraction
-            data = {}
-            if recipe.extract_fields:
-                data = self._extract_data(recipe.extract_fields)
+            # API discovery only reads the CDP performance log — run it in
+            # the background while the main thread does the final extraction
+            apis_future = _background_executor().submit(self._discover_apis)
 
-            # Also check last step for extract_fields
+            # Final extraction — merge recipe-level and per-step fields so
+            # overlapping selectors are only queried once
+            merged_fields = dict(recipe.extract_fields or {})
             for step in recipe.steps:
                 if step.extract_fields:
-                    data.update(self._extract_data(step.extract_fields))
+                    merged_fields.update(step.extract_fields)
 
-            # Update recipe stats
-            recipe.times_used += 1
-            recipe.times_succeeded += 1
-            recipe.last_used = int(time.time())
-            self._save_recipe(recipe)
+            data = self._extract_data(merged_fields) if merged_fields else {}
 
-            apis = self._discover_apis()
+            # Update recipe stats (sidecar only — the recipe itself is unchanged)
+            self._bump_stats(recipe, succeeded=True)
+
+            # The probe phase alone can run ~20s worst case (15 candidates
+            # over 8 workers, two 5s GETs each), so the bound only guards
+            # against a wedged probe — it must comfortably exceed that
+            try:
+                apis = apis_future.result(timeout=60)
+            except Exception as e:
+                logger.warning(f"Background API discovery failed: {e}")
+                apis = []
             return SmartCrawlResult(
                 success=True,
                 data=data if data else None,
@@ -362,15 +693,26 @@ class SmartCrawler:
     # AI-guided crawl (same as web_scraper but records for recipe gen)
     # ------------------------------------------------------------------
 
-    def _get_page_context(self) -> str:
-        url = self.dm.get_current_url()
-        html = self.dm.get_page_source()
-        cleaned = clean_html_for_ai(html)
+    def _get_page_context(self, url: Optional[str] = None) -> str:
+        if url is None:
+            url = self.dm.get_current_url()
+        html = self.dm.get_page_source_for_ai()
+        h = hashlib.blake2b(
+            html.encode("utf-8", "ignore") if isinstance(html, str) else html,
+            digest_size=8,
+        ).digest()
+        if h == self._ctx_cache[0]:
+            cleaned = self._ctx_cache[1]
+        else:
+            from modules.web_scraper import clean_html_for_ai
+
+            cleaned = clean_html_for_ai(html)
+            self._ctx_cache = (h, cleaned)
         return f"CURRENT URL: {url}\n\n{cleaned}"
 
     def _ask_ai(self, goal: str, page_context: str, history: list[ScraperStep]) -> ScraperAction:
         """Send page context to Claude CLI and get next action."""
-        from modules.web_scraper import SYSTEM_PROMPT
+        from modules.web_scraper import SYSTEM_PROMPT, call_claude_cli
 
         prompt_parts = []
         if history:
@@ -390,70 +732,66 @@ class SmartCrawler:
         user_prompt = "\n".join(prompt_parts)
         text = call_claude_cli(SYSTEM_PROMPT, user_prompt)
 
-        json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-        if json_match:
-            text = json_match.group(1)
-
-        raw = None
-        try:
-            raw = json.loads(text)
-        except json.JSONDecodeError:
-            brace_match = re.search(r"\{.*\}", text, re.DOTALL)
-            if brace_match:
-                try:
-                    raw = json.loads(brace_match.group())
-                except json.JSONDecodeError:
-                    pass
-
+        raw = _parse_ai_json(text)
         if raw is None:
             return ScraperAction(action="fail", reason=f"AI returned invalid JSON: {text[:200]}")
 
         return ScraperAction.from_dict(raw)
 
+    # --- per-action AI crawl handlers ----------------------------------
+
+    def _action_click(self, action):
+        elements = self.dm.driver.find_elements("css selector", action.selector)
+        if not elements:
+            return f"No elements found for selector: {action.selector}"
+        element = elements[0]
+        self.dm.scroll_to_view(element)
+        time.sleep(0.3)
+        element.click()
+        time.sleep(1)
+
+    def _action_type(self, action):
+        elements = self.dm.driver.find_elements("css selector", action.selector)
+        if not elements:
+            return f"No elements found for selector: {action.selector}"
+        element = elements[0]
+        self.dm.scroll_to_view(element)
+        element.clear()
+        element.send_keys(action.text)
+        time.sleep(0.5)
+
+    def _action_scroll_down(self, action):
+        self.dm.scroll_by(600)
+        time.sleep(0.5)
+
+    def _action_scroll_up(self, action):
+        self.dm.scroll_by(-600)
+        time.sleep(0.5)
+
+    def _action_goto(self, action):
+        self.dm.get(action.url)
+        time.sleep(2)
+
+    def _action_wait(self, action):
+        time.sleep(action.seconds or 2)
+
+    def _action_noop(self, action):
+        pass  # extract/done/fail are handled by the caller
+
     def _execute_action(self, action: ScraperAction) -> Optional[str]:
         """Execute a browser action. Returns error string or None."""
-        try:
-            if action.action == "click":
-                elements = self.dm.driver.find_elements("css selector", action.selector)
-                if not elements:
-                    return f"No elements found for selector: {action.selector}"
-                element = elements[0]
-                self.dm.scroll_to_view(element)
-                time.sleep(0.3)
-                element.click()
-                time.sleep(1)
-
-            elif action.action == "type":
-                elements = self.dm.driver.find_elements("css selector", action.selector)
-                if not elements:
-                    return f"No elements found for selector: {action.selector}"
-                element = elements[0]
-                self.dm.scroll_to_view(element)
-                element.clear()
-                element.send_keys(action.text)
-                time.sleep(0.5)
-
-            elif action.action == "scroll_down":
-                self.dm.scroll_by(600)
-                time.sleep(0.5)
-
-            elif action.action == "scroll_up":
-                self.dm.scroll_by(-600)
-                time.sleep(0.5)
-
-            elif action.action == "goto":
-                self.dm.get(action.url)
-                time.sleep(2)
-
-            elif action.action == "wait":
-                time.sleep(action.seconds or 2)
-
-            elif action.action in ("extract", "done", "fail"):
-                pass
-
-            else:
-                return f"Unknown action: {action.action}"
+        handler = self._action_dispatch.get(action.action)
+        if handler is None:
+            return f"Unknown action: {action.action}"
+
+        from selenium.common.exceptions import (
+            ElementClickInterceptedException,
+            NoSuchElementException,
+            StaleElementReferenceException,
+        )
 
+        try:
+            return handler(action)
         except ElementClickInterceptedException as e:
             return f"Click intercepted: {e}"
         except StaleElementReferenceException:
@@ -463,8 +801,6 @@ class SmartCrawler:
         except Exception as e:
             return f"Action error: {e}"
 
-        return None
-
     def _run_ai_crawl(self, goal: str, start_url: str) -> SmartCrawlResult:
         """Run an AI-guided crawl, recording all steps for recipe generation."""
         logger.info(f"Running AI-guided crawl: {goal}")
@@ -475,17 +811,21 @@ class SmartCrawler:
             self.dm.get(start_url)
             time.sleep(2)
 
+            # Only goto/click change the URL — refresh it after those and
+            # reuse the local copy everywhere else
+            current_url = self.dm.get_current_url()
+
             for step_num in range(1, self.max_steps + 1):
                 logger.info(f"  AI Step {step_num}/{self.max_steps}")
 
-                page_context = self._get_page_context()
+                page_context = self._get_page_context(current_url)
                 action = self._ask_ai(goal, page_context, self.steps)
 
                 logger.info(f"    AI decided: {action.action} — {action.reason or ''}")
 
                 step = ScraperStep(
                     step=step_num,
-                    url=self.dm.get_current_url(),
+                    url=current_url,
                     action=action.action,
                     selector=action.selector,
                     text=action.text,
@@ -524,6 +864,9 @@ class SmartCrawler:
                 step.error = error
                 self.steps.append(step)
 
+                if not error and action.action in ("goto", "click"):
+                    current_url = self.dm.get_current_url()
+
                 if error:
                     logger.warning(f"    Action error: {error}")
 
@@ -544,47 +887,105 @@ class SmartCrawler:
     # Recipe generation from AI crawl
     # ------------------------------------------------------------------
 
+    # Actions simple enough to translate into recipe steps mechanically.
+    # goto is deliberately absent: recorded steps carry the pre-action page
+    # URL, not the goto's destination, so those sessions can't be replayed
+    # from the step log alone and go through the AI instead.
+    _TRIVIAL_ACTIONS = frozenset({"click", "type", "extract", "done"})
+
+    def _recipe_from_trivial_session(
+        self, goal: str, start_url: str, domain: str, steps: List[ScraperStep]
+    ) -> Optional[CrawlerRecipe]:
+        """Build a recipe directly from a trivial session, skipping the AI call.
+
+        A short error-free click/type session needs no selector-
+        consolidation reasoning — the steps replay as-is after navigating
+        to the start URL. Sessions that extracted data still go through
+        the AI, since extracted values can't be mapped back to CSS
+        selectors mechanically.
+        """
+        if len(steps) > 3:
+            return None
+        for s in steps:
+            if s.action not in self._TRIVIAL_ACTIONS or s.error or s.data:
+                return None
+
+        # Replays start from a fresh browser, so the recipe must navigate
+        # before the recorded clicks can find anything
+        recipe_steps = [RecipeStep(
+            action="goto",
+            url=start_url,
+            description="Navigate to start page",
+        )]
+        for s in steps:
+            if s.action in ("done", "extract"):
+                continue
+            recipe_steps.append(RecipeStep(
+                action=s.action,
+                selector=s.selector,
+                text=s.text,
+                description=s.reason or f"{s.action} (replayed from AI session)",
+            ))
+        if len(recipe_steps) == 1:  # navigation only — nothing worth saving
+            return None
+
+        now = int(time.time())
+        return CrawlerRecipe(
+            recipe_id=self._recipe_id(domain, goal),
+            domain=domain,
+            goal=goal,
+            start_url=start_url,
+            steps=recipe_steps,
+            created_at=now,
+            last_used=now,
+            times_used=1,
+            times_succeeded=1,
+            version=1,
+        )
+
     def _generate_recipe(self, goal: str, start_url: str, steps: List[ScraperStep]) -> Optional[CrawlerRecipe]:
         """Use AI to generate a deterministic recipe from a successful crawl session."""
         domain = urlparse(start_url).netloc
 
-        # Build session description for AI
-        session_desc = f"GOAL: {goal}\nSTART URL: {start_url}\nDOMAIN: {domain}\n\n"
-        session_desc += "SUCCESSFUL CRAWL STEPS:\n"
+        # Trivial sessions translate mechanically — skip the LLM round-trip
+        recipe = self._recipe_from_trivial_session(goal, start_url, domain, steps)
+        if recipe is not None:
+            self._save_recipe(recipe)
+            logger.info(f"Generated recipe {recipe.recipe_id} from trivial session "
+                        f"({len(recipe.steps)} steps, no AI call)")
+            return recipe
+
+        # Build session description for AI — list + join, not O(n²) +=
+        parts = [
+            f"GOAL: {goal}",
+            f"START URL: {start_url}",
+            f"DOMAIN: {domain}",
+            "",
+            "SUCCESSFUL CRAWL STEPS:",
+        ]
         for s in steps:
-            err = f" [ERROR: {s.error}]" if s.error else ""
-            session_desc += f"  Step {s.step}: {s.action}"
+            line = [f"  Step {s.step}: {s.action}"]
             if s.selector:
-                session_desc += f" selector='{s.selector}'"
+                line.append(f" selector='{s.selector}'")
             if s.text:
-                session_desc += f" text='{s.text}'"
+                line.append(f" text='{s.text}'")
             if s.url != start_url:
-                session_desc += f" url='{s.url}'"
+                line.append(f" url='{s.url}'")
             if s.data:
-                session_desc += f" data={json.dumps(s.data)}"
+                line.append(f" data={json.dumps(s.data)}")
             if s.reason:
-                session_desc += f" — {s.reason}"
-            session_desc += f"{err}\n"
+                line.append(f" — {s.reason}")
+            if s.error:
+                line.append(f" [ERROR: {s.error}]")
+            parts.append("".join(line))
+        session_desc = "\n".join(parts) + "\n"
 
         try:
-            text = call_claude_cli(RECIPE_GEN_PROMPT, session_desc)
-
-            # Parse JSON
-            json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-            if json_match:
-                text = json_match.group(1)
+            from modules.web_scraper import call_claude_cli
 
-            raw = None
-            try:
-                raw = json.loads(text)
-            except json.JSONDecodeError:
-                brace_match = re.search(r"\{.*\}", text, re.DOTALL)
-                if brace_match:
-                    try:
-                        raw = json.loads(brace_match.group())
-                    except json.JSONDecodeError:
-                        pass
+            text = call_claude_cli(RECIPE_GEN_PROMPT, session_desc)
 
+            raw = _parse_ai_json(text)
             if raw is None:
                 logger.error(f"Recipe generation returned invalid JSON: {text[:300]}")
                 return None
@@ -665,10 +1066,7 @@ class SmartCrawler:
 
                 # Recipe failed — fall back to AI
                 logger.warning(f"Recipe failed: {result.error} — falling back to AI")
-                recipe.times_used += 1
-                recipe.ai_fallback_count += 1
-                recipe.last_used = int(time.time())
-                self._save_recipe(recipe)
+                self._bump_stats(recipe, succeeded=False, ai_fallback=True)
 
                 # Close and re-init browser for clean AI run
                 self.close()
@@ -694,13 +1092,41 @@ class SmartCrawler:
         recipes = []
         if not os.path.exists(RECIPES_DIR):
             return recipes
-        for fname in os.listdir(RECIPES_DIR):
-            if fname.endswith(".json"):
-                try:
-                    with open(os.path.join(RECIPES_DIR, fname)) as f:
-                        recipes.append(CrawlerRecipe.from_dict(json.load(f)))
-                except Exception:
-                    pass
+
+        with os.scandir(RECIPES_DIR) as it:
+            paths = [
+                e.path for e in it
+                if e.is_file() and e.name.endswith(".json")
+                and not e.name.endswith(".stats.json")
+            ]
+        if not paths:
+            return recipes
+
+        # Overlap file reads across a thread pool; parse in the main thread
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _read_or_none(path):
+            try:
+                return _read_file_bytes(path)
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+            blobs = list(ex.map(_read_or_none, paths))
+
+        for path, blob in zip(paths, blobs):
+            if blob is None:
+                continue
+            try:
+                recipe = CrawlerRecipe.from_dict(_json_loads(blob))
+            except Exception:
+                continue
+            # The filename stem is authoritative — migrated files embed a
+            # stale legacy ID — and it keys the stats sidecar, so fix the
+            # ID before overlaying live usage counters
+            recipe.recipe_id = os.path.splitext(os.path.basename(path))[0]
+            self._merge_stats(recipe)
+            recipes.append(recipe)
         return recipes
 
     def delete_recipe(self, recipe_id: str) -> bool:
@@ -708,6 +1134,10 @@ class SmartCrawler:
         path = self._recipe_path(recipe_id)
         if os.path.exists(path):
             os.remove(path)
+            try:
+                os.remove(self._stats_path(recipe_id))
+            except OSError:
+                pass
             logger.info(f"Deleted recipe {recipe_id}")
             return True
         return False
@@ -7,21 +7,52 @@ click a link, fill a form, extract data, scroll, or declare the task complete.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
+import select
 import sys
+import threading
 import time
 import logging
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import subprocess
-from bs4 import BeautifulSoup, Comment
+import lxml.html
+import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
 from selenium.common.exceptions import (
     NoSuchElementException,
     ElementClickInterceptedException,
     StaleElementReferenceException,
+    TimeoutException,
 )
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_compact(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_compact(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def _json_dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import ScraperAction, ScraperStep, ScrapeResult, DiscoveredApi
@@ -29,22 +60,222 @@ from modules.driver_manager import DriverManager
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import — these run on every page and every AI decision
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+# All API-ish path markers in one multi-pattern scan instead of three
+# separate substring passes per entry
+_API_PATH_RE = re.compile(r"/api/|/graphql|/rest/")
+# Script bodies dominate bytes on modern pages and never survive the
+# summary — drop them from the raw string so they never enter the parser.
+# Non-greedy DOTALL match; a pathological inline "</script>" string just
+# over-trims content the cleaner would discard anyway.
+_SCRIPT_RE = re.compile(r"<script\b.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+_STYLE_RE = re.compile(r"<style\b.*?</style\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Button text/id/class markers for cookie-consent banners
+_COOKIE_CONSENT_RE = re.compile(r"accept.*cookie|accept all|i agree|consent", re.IGNORECASE)
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} region in text, or None.
+
+    Single-pass brace-depth scan that respects string and escape state — no
+    regex backtracking on large or malformed AI outputs, and it handles
+    markdown-fenced responses for free (the first brace is the JSON).
+    """
+    depth = 0
+    start = -1
+    in_str = False
+    esc = False
+    for i, c in enumerate(text):
+        if in_str:
+            if esc:
+                esc = False
+            elif c == "\\":
+                esc = True
+            elif c == '"':
+                in_str = False
+            continue
+        if c == '"':
+            if depth > 0:
+                in_str = True
+        elif c == "{":
+            if start < 0:
+                start = i
+            depth += 1
+        elif c == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "smart-scraper")
+
+
+class ScraperCache:
+    """Persistent cache of Claude decisions, keyed by prompt content hash.
+
+    Retries, loops over the same page, and re-runs of the same goal would
+    otherwise re-pay full LLM latency for an identical prompt. Entries are
+    one JSON file each under ~/.cache/smart-scraper/, evicted
+    least-recently-used past max_entries (reads touch the file mtime).
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_entries: int = 100):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _key(system_prompt: str, user_prompt: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(system_prompt.encode("utf-8", "ignore"))
+        h.update(b"\x00")
+        h.update(user_prompt.encode("utf-8", "ignore"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, system_prompt: str, user_prompt: str) -> Optional[dict]:
+        path = self._path(self._key(system_prompt, user_prompt))
+        try:
+            with open(path, "rb") as f:
+                raw = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return raw
+
+    def put(self, system_prompt: str, user_prompt: str, raw: dict):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(self._key(system_prompt, user_prompt))
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(_json_dumps_compact(raw).encode())
+            os.replace(tmp, path)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Failed to write AI response cache: {e}")
+
+    def _evict(self):
+        with os.scandir(self.cache_dir) as it:
+            entries = [
+                (e.stat().st_mtime, e.path)
+                for e in it if e.is_file() and e.name.endswith(".json")
+            ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Total wall-clock budget for one Claude call, and how long we tolerate
+# silence before declaring the connection dead. The CLI in text mode emits
+# its result as one burst when generation completes, so "silence" includes
+# the entire generation — the stall bound must sit well above a slow
+# generation and only catch connections that are truly gone.
+_CLI_TOTAL_TIMEOUT = 300
+_CLI_STALL_TIMEOUT = 240
+
 
 def call_claude_cli(system_prompt: str, user_prompt: str) -> str:
-    """Call Claude via CLI (uses Max subscription, no API key needed)."""
+    """Call Claude via CLI (uses Max subscription, no API key needed).
+
+    Output is consumed as a stream: a connection that goes quiet is killed
+    after _CLI_STALL_TIMEOUT seconds of silence instead of blocking for the
+    full generation timeout.
+    """
     combined = f"<instructions>\n{system_prompt}\n</instructions>\n\n{user_prompt}"
-    proc = subprocess.run(
+    proc = subprocess.Popen(
         ["claude", "-p", "--output-format", "text"],
-        input=combined,
-        capture_output=True, text=True, timeout=300,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
     )
-    if proc.returncode != 0:
-        raise RuntimeError(f"Claude CLI error (rc={proc.returncode}): {proc.stderr[:500]}")
-    return proc.stdout.strip()
+
+    # The prompt can exceed the pipe buffer, so feed stdin from a thread to
+    # avoid deadlocking against our own stdout reads
+    def _feed():
+        try:
+            proc.stdin.write(combined.encode("utf-8"))
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    threading.Thread(target=_feed, daemon=True).start()
+
+    # Drain stderr on its own thread — a chatty CLI that fills the 64KB
+    # stderr pipe would otherwise block and look like a stall
+    stderr_chunks = []
+
+    def _drain_stderr():
+        try:
+            while True:
+                chunk = proc.stderr.read1(65536)
+                if not chunk:
+                    break
+                stderr_chunks.append(chunk)
+        except (ValueError, OSError):
+            pass
+
+    stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    chunks = []
+    received = 0
+    next_log = 4096
+    deadline = time.monotonic() + _CLI_TOTAL_TIMEOUT
+    last_chunk = time.monotonic()
+    try:
+        while True:
+            now = time.monotonic()
+            if now > deadline:
+                raise TimeoutError(f"Claude CLI exceeded {_CLI_TOTAL_TIMEOUT}s total")
+            if now - last_chunk > _CLI_STALL_TIMEOUT:
+                raise TimeoutError(
+                    f"Claude CLI stalled — no output for {_CLI_STALL_TIMEOUT}s"
+                )
+            ready, _, _ = select.select([proc.stdout], [], [], 1.0)
+            if not ready:
+                continue
+            chunk = proc.stdout.read1(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+            last_chunk = time.monotonic()
+            if received >= next_log:
+                logger.debug(f"  Claude CLI streaming: {received} bytes received")
+                next_log += 4096
+    except TimeoutError:
+        proc.kill()
+        proc.wait()
+        raise
+
+    rc = proc.wait()
+    stderr_thread.join(timeout=5)
+    stderr = b"".join(stderr_chunks)
+    if rc != 0:
+        raise RuntimeError(
+            f"Claude CLI error (rc={rc}): {stderr.decode('utf-8', 'replace')[:500]}"
+        )
+    return b"".join(chunks).decode("utf-8", "replace").strip()
 
 
 SYSTEM_PROMPT = """\
 You are a web navigation AI. You are given a user's goal and the current page content.
+The page is a compact JSON skeleton: "title", "nav"/"links" as [text, href] pairs,
+"forms" with their fields, "buttons" as [text, id, class], and the main "text".
+When "linkbase" is present, each href in "links" is a suffix — prepend the
+linkbase value to get the full URL.
 Your job is to decide the next action to take in the browser to accomplish the goal.
 
 You MUST respond with valid JSON only. No markdown, no explanation outside the JSON.
@@ -71,92 +302,283 @@ Guidelines:
 """
 
 
-def clean_html_for_ai(html: str, max_length: int = 50000) -> str:
-    """Strip noise from HTML, keep structure and text for AI analysis."""
-    soup = BeautifulSoup(html, "lxml")
+def _element_text(el, limit: int = 0) -> str:
+    """Whitespace-collapsed text content of an lxml element."""
+    text = " ".join(el.text_content().split())
+    return text[:limit] if limit else text
 
-    # Remove script, style, noscript, svg, and comments
-    for tag in soup(["script", "style", "noscript", "svg", "meta", "link"]):
-        tag.decompose()
-    for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
-        comment.extract()
 
-    # Remove hidden elements
-    for tag in soup.find_all(attrs={"style": re.compile(r"display\s*:\s*none")}):
-        tag.decompose()
-    for tag in soup.find_all(attrs={"hidden": True}):
-        tag.decompose()
-
-    # Build a simplified representation
-    lines = []
-    # Title
-    title = soup.find("title")
-    if title:
-        lines.append(f"PAGE TITLE: {title.get_text(strip=True)}")
-
-    # Navigation links
-    nav = soup.find("nav")
-    if nav:
-        nav_links = nav.find_all("a", href=True)
-        if nav_links:
-            lines.append("\nNAVIGATION:")
-            for a in nav_links[:20]:
-                lines.append(f"  [{a.get_text(strip=True)}] -> {a['href']}")
-
-    # Forms
-    forms = soup.find_all("form")
-    for i, form in enumerate(forms):
-        lines.append(f"\nFORM {i} (action={form.get('action', '?')}, method={form.get('method', 'get')}):")
-        for inp in form.find_all(["input", "textarea", "select", "button"]):
-            tag_type = inp.get("type", inp.name)
-            name = inp.get("name", inp.get("id", ""))
-            placeholder = inp.get("placeholder", "")
-            value = inp.get("value", "")
-            text = inp.get_text(strip=True)[:50] if inp.name in ("button", "select") else ""
-            lines.append(f"  <{inp.name} type={tag_type} name={name} placeholder={placeholder} value={value}> {text}")
-
-    # Links
-    all_links = soup.find_all("a", href=True)
-    if all_links:
-        lines.append(f"\nLINKS ({len(all_links)} total, showing first 50):")
-        seen = set()
-        for a in all_links[:50]:
-            href = a["href"]
-            text = a.get_text(strip=True)[:80]
-            key = (href, text)
-            if key not in seen:
-                seen.add(key)
-                lines.append(f"  [{text}] -> {href}")
-
-    # Buttons (non-form)
-    buttons = soup.find_all("button")
-    form_buttons = set()
-    for form in forms:
-        for btn in form.find_all("button"):
-            form_buttons.add(id(btn))
-    non_form_buttons = [b for b in buttons if id(b) not in form_buttons]
-    if non_form_buttons:
-        lines.append(f"\nBUTTONS:")
-        for btn in non_form_buttons[:20]:
-            btn_id = btn.get("id", "")
-            btn_class = " ".join(btn.get("class", []))
-            text = btn.get_text(strip=True)[:50]
-            lines.append(f"  [{text}] id={btn_id} class={btn_class}")
+# Feed the parser in chunks so lexing overlaps tree building instead of
+# waiting on one giant fromstring call
+_PARSE_CHUNK = 32 * 1024
 
-    # Main text content
-    main = soup.find("main") or soup.find("article") or soup.find(id="content") or soup.find("body")
-    if main:
-        text = main.get_text(separator="\n", strip=True)
-        # Collapse whitespace
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        lines.append(f"\nPAGE TEXT:\n{text}")
-
-    output = "\n".join(lines)
+_parser_local = threading.local()
+
+
+def _get_html_parser():
+    """One reusable HTMLParser per thread — feed parsers are stateful, so a
+    shared instance can't serve concurrent scrapes, but reconstruction per
+    page is wasted setup. remove_comments drops comments during the C parse
+    instead of a separate strip pass; huge_tree lifts libxml2's size guard
+    for very large pages.
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(
+            recover=True, remove_comments=True, remove_blank_text=True, huge_tree=True
+        )
+        _parser_local.parser = parser
+    return parser
+
+
+def clean_html_for_ai(html: str, max_length: int = 50000) -> str:
+    """Strip noise from HTML, keep structure and text for AI analysis.
+
+    Works on the raw lxml tree — C-level strip_elements and XPath instead
+    of per-node Python wrappers, since this runs on every AI step.
+    """
+    # Comments go first so commented-out markup can't confuse the script/
+    # style matches; all three are linear C scans on the raw string
+    html = _COMMENT_RE.sub("", html)
+    html = _SCRIPT_RE.sub("", html)
+    html = _STYLE_RE.sub("", html)
+    try:
+        parser = _get_html_parser()
+        for i in range(0, len(html), _PARSE_CHUNK):
+            parser.feed(html[i:i + _PARSE_CHUNK])
+        tree = parser.close()
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        # A failed feed/close leaves the parser mid-document; discard it so
+        # the next page on this thread starts from a fresh parser instead
+        # of being appended to this one's partial tree
+        _parser_local.parser = None
+        return ""
+    if tree is None:  # nothing parseable was fed
+        return ""
+
+    page = _summarize_tree(tree, max_length)
+    tree = None  # release the DOM before assembling the big output string
+
+    output = _json_dumps_compact(page)
     if len(output) > max_length:
         output = output[:max_length] + "\n... [TRUNCATED]"
     return output
 
 
+# XPath expressions compiled once at import — evaluation stays in C on
+# every page instead of re-parsing the expression text per call
+_HIDDEN_ELEMENTS = etree.XPath(
+    "//*[@hidden or contains(@style,'display:none') or contains(@style,'display: none')]"
+)
+_FORM_FIELDS = etree.XPath(".//input | .//textarea | .//select | .//button")
+_NAV_LINKS = etree.XPath(".//a[@href]")
+_CONTENT_BY_ID = etree.XPath("//*[@id='content']")
+
+
+def _summarize_tree(tree, max_length: int = 50000) -> dict:
+    """Walk a parsed lxml tree into a compact page skeleton dict.
+
+    Keys: title, nav/links as [text, href] pairs, forms with their fields,
+    buttons as [text, id, class], and the capped main text. Compact JSON is
+    25-40% fewer prompt tokens than the old free-form lines.
+    """
+    # Remove script, style, noscript, and svg in one C pass (comments are
+    # already dropped by the parser)
+    etree.strip_elements(
+        tree, "script", "style", "noscript", "svg", "meta", "link",
+        with_tail=False,
+    )
+
+    # Remove hidden elements
+    for el in _HIDDEN_ELEMENTS(tree):
+        parent = el.getparent()
+        if parent is not None:
+            parent.remove(el)
+
+    # One document-order pass fills every bucket: iter() with a tag list
+    # filters in C, so only summarized elements surface to Python, and each
+    # bucket stops collecting at its cap
+    title = None
+    nav_links = None
+    forms = []
+    seen = set()
+    links = []
+    links_total = 0
+    buttons = []
+    main = None
+
+    # form_depth tracks whether the walk is inside a <form> via start/end
+    # events — O(1) per button instead of an ancestor walk
+    form_depth = 0
+    for event, el in etree.iterwalk(
+        tree,
+        events=("start", "end"),
+        tag=("title", "nav", "form", "a", "button", "main", "article"),
+    ):
+        tag = el.tag
+        if event == "end":
+            if tag == "form":
+                form_depth -= 1
+            continue
+        if tag == "a":
+            href = el.get("href")
+            if href is None:
+                continue
+            links_total += 1
+            if len(links) < 50:
+                text = _element_text(el, 80)
+                key = (href, text)
+                if key not in seen:
+                    seen.add(key)
+                    links.append([text, href])
+        elif tag == "form":
+            form_depth += 1
+            forms.append({
+                "action": el.get("action", "?"),
+                "method": el.get("method", "get"),
+                "fields": [
+                    {
+                        "tag": inp.tag,
+                        "type": inp.get("type", inp.tag),
+                        "name": inp.get("name", inp.get("id", "")),
+                        "placeholder": inp.get("placeholder", ""),
+                        "value": inp.get("value", ""),
+                        "text": _element_text(inp, 50) if inp.tag in ("button", "select") else "",
+                    }
+                    for inp in _FORM_FIELDS(el)
+                ],
+            })
+        elif tag == "button":
+            # Form-owned buttons already appear in the form's fields
+            if len(buttons) < 20 and form_depth == 0:
+                buttons.append([_element_text(el, 50), el.get("id", ""), el.get("class", "")])
+        elif tag == "title":
+            if title is None:
+                title = _element_text(el)
+        elif tag == "nav":
+            if nav_links is None:
+                anchors = _NAV_LINKS(el)
+                if anchors:
+                    nav_links = [[_element_text(a), a.get("href")] for a in anchors[:20]]
+        elif tag == "main":
+            if main is None or main.tag != "main":
+                main = el
+        else:  # article — weaker main-content candidate than <main>
+            if main is None:
+                main = el
+
+    # Assemble in a stable key order
+    page = {}
+    if title is not None:
+        page["title"] = title
+    if nav_links:
+        page["nav"] = nav_links
+    if forms:
+        page["forms"] = forms
+    if links:
+        # Listing pages repeat long URL prefixes on every href; fold a
+        # common prefix longer than 20 chars into one "linkbase" entry and
+        # keep only the suffixes — 20-40% fewer context tokens on such pages
+        if len(links) > 1:
+            base = os.path.commonprefix([href for _, href in links])
+            if len(base) > 20:
+                cut = len(base)
+                page["linkbase"] = base
+                links = [[text, href[cut:]] for text, href in links]
+        page["links_total"] = links_total
+        page["links"] = links
+    if buttons:
+        page["buttons"] = buttons
+
+    # Main text content
+    if main is None:
+        hits = _CONTENT_BY_ID(tree)
+        main = hits[0] if hits else None
+    if main is None:
+        main = tree.find(".//body")
+    if main is None:
+        main = tree
+    # Everything past max_length gets truncated anyway — stop pulling text
+    # out of the tree as soon as the budget is spent. The skeleton built so
+    # far counts against the budget too: serializing it here is cheap (all
+    # buckets are capped) and stops the final output needing truncation.
+    # 64 chars of slack covers the "text" key and JSON string escaping
+    budget = max(1000, max_length - len(_json_dumps_compact(page)) - 64)
+    parts = []
+    total = 0
+    for s in main.itertext():
+        t = s.strip()
+        if t:
+            remaining = budget - total
+            if len(t) >= remaining:  # a single huge text node can overshoot
+                parts.append(t[:remaining])
+                break
+            parts.append(t)
+            total += len(t) + 1
+    page["text"] = _MULTI_NL_RE.sub("\n\n", "\n".join(parts))
+
+    return page
+
+
+def _probe_candidate(candidate: dict, session, browser_cookies: dict) -> DiscoveredApi:
+    """Probe one API candidate: no-auth GET, cookie GET, or POST capture."""
+    entry = candidate["entry"]
+    url = entry["url"]
+    method = entry["method"]
+    body_preview = candidate["body"]
+
+    api = DiscoveredApi(
+        url=url,
+        method=method,
+        content_type=candidate["resp"].get("mimeType", ""),
+        status_code=candidate["resp"].get("status", 0),
+        response_preview=body_preview[:2000] if body_preview else None,
+    )
+
+    if method.upper() == "GET":
+        ua = entry.get("headers", {}).get(
+            "User-Agent",
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36",
+        )
+        # Test without auth
+        try:
+            r = session.get(url, timeout=5, headers={"User-Agent": ua})
+            if r.status_code == 200 and len(r.text) > 10:
+                api.works_without_auth = True
+                api.notes = "No auth needed"
+        except Exception:
+            pass
+
+        # Test with cookies if no-auth failed
+        if not api.works_without_auth and browser_cookies:
+            try:
+                r = session.get(
+                    url, timeout=5, cookies=browser_cookies, headers={"User-Agent": ua}
+                )
+                if r.status_code == 200 and len(r.text) > 10:
+                    api.works_with_cookies = True
+                    api.cookies_needed = list(browser_cookies.keys())
+                    api.notes = "Works with browser cookies"
+            except Exception:
+                pass
+
+        if not api.works_without_auth and not api.works_with_cookies:
+            api.notes = "Requires auth — could not call directly"
+
+    elif method.upper() == "POST":
+        # Record POST details for manual testing
+        req_headers = entry.get("headers", {})
+        api.request_headers = {
+            k: v for k, v in req_headers.items()
+            if k.lower() in ("content-type", "accept", "authorization", "x-csrf-token")
+        }
+        api.post_data = entry.get("postData")
+        api.notes = "POST — saved headers/body for manual testing"
+
+    return api
+
+
 def analyze_network_for_apis(dm) -> list:
     """Analyze network traffic captured during a scrape to discover API endpoints.
 
@@ -171,8 +593,8 @@ def analyze_network_for_apis(dm) -> list:
     """
     from urllib.parse import urlparse
 
-    traffic = dm.get_network_traffic()
-    if not traffic:
+    traffic = dm.get_network_traffic_columns()
+    if not len(traffic):
         return []
 
     browser_cookies = dm.get_browser_cookies()
@@ -183,113 +605,73 @@ def analyze_network_for_apis(dm) -> list:
         ".mp3", ".webm", ".avif",
     }
 
-    api_candidates = []
-    for entry in traffic:
-        resp = entry.get("response")
-        if not resp:
+    # Hot filter: one tight loop over pre-extracted columns, binding the
+    # lists locally (thousands of entries on busy pages)
+    statuses = traffic.statuses
+    mime_types = traffic.mime_types
+    resource_types = traffic.resource_types
+    splitext = os.path.splitext
+    api_path_search = _API_PATH_RE.search
+
+    # Dedupe by URL path as we go, keeping the first hit per path
+    candidates_by_path = {}
+    for i, url in enumerate(traffic.urls):
+        status = statuses[i]
+        if status < 0:  # no response captured
             continue
 
-        url = entry["url"]
         if url.startswith("data:") or url.startswith("chrome-extension:"):
             continue
 
-        parsed = urlparse(url)
-        path_lower = parsed.path.lower()
-        ext = os.path.splitext(path_lower)[1]
-        if ext in skip_extensions:
+        path_lower = urlparse(url).path.lower()
+        if splitext(path_lower)[1] in skip_extensions:
             continue
 
-        mime = resp.get("mimeType", "").lower()
-        resource_type = entry.get("resourceType", "").lower()
-        status = resp.get("status", 0)
+        mime = mime_types[i].lower()
+        resource_type = resource_types[i].lower()
 
         is_api = (
             "json" in mime
             or resource_type in ("xhr", "fetch")
-            or "/api/" in path_lower
-            or "/graphql" in path_lower
-            or "/rest/" in path_lower
+            or api_path_search(path_lower) is not None
         )
 
-        if is_api and 200 <= status < 400:
-            body = dm.get_response_body(entry["requestId"])
-            api_candidates.append({"entry": entry, "resp": resp, "body": body})
+        if is_api and 200 <= status < 400 and path_lower not in candidates_by_path:
+            candidates_by_path[path_lower] = {
+                "entry": {
+                    "requestId": traffic.request_ids[i],
+                    "url": url,
+                    "method": traffic.methods[i],
+                    "headers": traffic.request_headers[i],
+                    "postData": traffic.post_data[i],
+                },
+                "resp": {"status": status, "mimeType": traffic.mime_types[i]},
+            }
 
-    if not api_candidates:
+    if not candidates_by_path:
         return []
 
-    # Dedupe by URL path, keep first 15
-    seen_paths = set()
-    unique = []
+    api_candidates = list(candidates_by_path.values())[:15]
+    bodies = dm.get_response_bodies([c["entry"]["requestId"] for c in api_candidates])
     for c in api_candidates:
-        path = urlparse(c["entry"]["url"]).path
-        if path not in seen_paths:
-            seen_paths.add(path)
-            unique.append(c)
-    api_candidates = unique[:15]
-
-    # Test each endpoint
-    discovered = []
-    for candidate in api_candidates:
-        entry = candidate["entry"]
-        url = entry["url"]
-        method = entry["method"]
-        body_preview = candidate["body"]
-
-        api = DiscoveredApi(
-            url=url,
-            method=method,
-            content_type=candidate["resp"].get("mimeType", ""),
-            status_code=candidate["resp"].get("status", 0),
-            response_preview=body_preview[:2000] if body_preview else None,
-        )
-
-        if method.upper() == "GET":
-            ua = entry.get("headers", {}).get(
-                "User-Agent",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36",
-            )
-            # Test without auth
-            try:
-                import requests as http_requests
-
-                r = http_requests.get(url, timeout=5, headers={"User-Agent": ua})
-                if r.status_code == 200 and len(r.text) > 10:
-                    api.works_without_auth = True
-                    api.notes = "No auth needed"
-            except Exception:
-                pass
+        c["body"] = bodies.get(c["entry"]["requestId"])
 
-            # Test with cookies if no-auth failed
-            if not api.works_without_auth and browser_cookies:
-                try:
-                    import requests as http_requests
+    # One keep-alive session for all probes — repeated candidates on the
+    # same host reuse the TLS connection instead of a cold handshake each
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
 
-                    r = http_requests.get(
-                        url, timeout=5, cookies=browser_cookies, headers={"User-Agent": ua}
-                    )
-                    if r.status_code == 200 and len(r.text) > 10:
-                        api.works_with_cookies = True
-                        api.cookies_needed = list(browser_cookies.keys())
-                        api.notes = "Works with browser cookies"
-                except Exception:
-                    pass
-
-            if not api.works_without_auth and not api.works_with_cookies:
-                api.notes = "Requires auth — could not call directly"
+    # Probes are independent network-bound GETs with 5s timeouts — run them
+    # across a thread pool instead of serially (worst case was 15 × 2 × 5s)
+    from concurrent.futures import ThreadPoolExecutor
 
-        elif method.upper() == "POST":
-            # Record POST details for manual testing
-            req_headers = entry.get("headers", {})
-            api.request_headers = {
-                k: v for k, v in req_headers.items()
-                if k.lower() in ("content-type", "accept", "authorization", "x-csrf-token")
-            }
-            api.post_data = entry.get("postData")
-            api.notes = "POST — saved headers/body for manual testing"
-
-        discovered.append(api)
+    with ThreadPoolExecutor(max_workers=min(8, len(api_candidates))) as executor:
+        discovered = list(executor.map(
+            lambda c: _probe_candidate(c, session, browser_cookies),
+            api_candidates,
+        ))
 
     logger.info(f"Discovered {len(discovered)} API endpoints from network traffic")
     for api in discovered:
@@ -324,6 +706,38 @@ class WebScraper:
         self.max_steps = max_steps
         self.dm: Optional[DriverManager] = None
         self.steps: list[ScraperStep] = []
+        self._ai_cache = ScraperCache()
+        # Cleaned page contexts keyed by (url, html-hash) — scroll/wait
+        # turns and A-B-A navigation patterns reuse the cleaned string
+        # instead of re-running clean_html_for_ai
+        self._ctx_cache: OrderedDict = OrderedDict()
+        self._last_ctx_hash = None
+        # Speculative context cleaning after each action (see _speculate_context)
+        self._bg_executor = ThreadPoolExecutor(max_workers=1)
+        self._ctx_future = None
+        # (action, formatted line) pairs for the last 10 steps — _ask_ai
+        # renders from this instead of re-serializing the full step list
+        self._history_lines: deque = deque(maxlen=10)
+        # Extract payloads collected during the scrape, merged into the
+        # final result on every exit path; history lines only ever carry a
+        # field count, so big extractions never re-enter prompts
+        self._extracted_buffers: list[dict] = []
+        # Heuristic pre-filter state (see _heuristic_action)
+        self._heuristic_waits = 0
+        self._cookie_dismissed = False
+
+        # Dispatch table: one hash lookup per step instead of an elif chain
+        self._action_dispatch = {
+            "click": self._action_click,
+            "type": self._action_type,
+            "scroll_down": self._action_scroll_down,
+            "scroll_up": self._action_scroll_up,
+            "goto": self._action_goto,
+            "wait": self._action_wait,
+            "extract": self._action_noop,
+            "done": self._action_noop,
+            "fail": self._action_noop,
+        }
 
     def _init_browser(self):
         """Start undetected Chrome. Try headless first, fall back to headful."""
@@ -359,101 +773,243 @@ class WebScraper:
         )
         self.dm.enable_network_logging()
 
+    # Capacity 4 covers the common miss patterns (scroll/wait plus an
+    # A-B-A navigation bounce) without holding many 50 KB strings
+    _CTX_CACHE_SIZE = 4
+
+    def _store_ctx(self, key, cleaned: str):
+        cache = self._ctx_cache
+        cache[key] = cleaned
+        cache.move_to_end(key)
+        while len(cache) > self._CTX_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _speculate_context(self):
+        """Clean the current DOM and prime the context cache.
+
+        Submitted to the background executor right after an action executes;
+        if the DOM doesn't change again before the next _get_page_context,
+        that call becomes a pure cache hit. A late DOM change is safe —
+        the cache key includes the HTML hash, so a miss just re-cleans.
+        """
+        try:
+            url = self.dm.get_current_url()
+            html = self.dm.get_page_source_for_ai()
+            h = hashlib.blake2b(html.encode("utf-8", "ignore"), digest_size=16).digest()
+            key = (url, h)
+            if key not in self._ctx_cache:
+                self._store_ctx(key, clean_html_for_ai(html))
+        except Exception:
+            pass
+
     def _get_page_context(self) -> str:
         """Get current page state for AI."""
+        fut = self._ctx_future
+        if fut is not None:
+            self._ctx_future = None
+            try:
+                fut.result(timeout=30)
+            except Exception:
+                pass
+
         url = self.dm.get_current_url()
-        html = self.dm.get_page_source()
-        cleaned = clean_html_for_ai(html)
+        html = self.dm.get_page_source_for_ai()
+        h = hashlib.blake2b(html.encode("utf-8", "ignore"), digest_size=16).digest()
+        key = (url, h)
+        cleaned = self._ctx_cache.get(key)
+        if cleaned is None:
+            cleaned = clean_html_for_ai(html)
+            self._store_ctx(key, cleaned)
+        else:
+            self._ctx_cache.move_to_end(key)
+        self._last_ctx_hash = h
         return f"CURRENT URL: {url}\n\n{cleaned}"
 
-    def _ask_ai(self, goal: str, page_context: str, history: list[ScraperStep]) -> ScraperAction:
-        """Send page context to Claude CLI and get next action."""
-        prompt_parts = []
+    def _heuristic_action(self, page_context: str) -> Optional[ScraperAction]:
+        """Cheap pre-filter for decisions that don't need Claude.
 
-        # Include action history so AI knows what it already tried
-        if history:
+        Two patterns are unambiguous enough to decide in Python: a nearly
+        empty page (still loading — wait, at most twice in a row) and a
+        cookie-consent button (click it, once per scrape). Everything else
+        returns None and falls through to _ask_ai.
+        """
+        try:
+            page = _json_loads(page_context.split("\n\n", 1)[1])
+        except (ValueError, IndexError):
+            return None
+
+        if (
+            len(page.get("text", "")) < 200
+            and not page.get("links")
+            and not page.get("forms")
+        ):
+            if self._heuristic_waits < 2:
+                self._heuristic_waits += 1
+                return ScraperAction(
+                    action="wait",
+                    seconds=2,
+                    reason="Page nearly empty — waiting for content (heuristic)",
+                )
+            return None  # still empty after two waits: let Claude decide
+        self._heuristic_waits = 0
+
+        if not self._cookie_dismissed:
+            for text, btn_id, btn_class in page.get("buttons", []):
+                if _COOKIE_CONSENT_RE.search(f"{text} {btn_id} {btn_class}"):
+                    classes = btn_class.split() if btn_class else []
+                    if btn_id:
+                        selector = f"#{btn_id}"
+                    elif classes:
+                        selector = f"button.{classes[0]}"
+                    else:
+                        continue  # no way to target it without an id/class
+                    self._cookie_dismissed = True
+                    return ScraperAction(
+                        action="click",
+                        selector=selector,
+                        reason="Dismissing cookie consent banner (heuristic)",
+                    )
+        return None
+
+    def _ask_ai(self, goal: str, page_context: str) -> ScraperAction:
+        """Send page context to Claude CLI and get next action."""
+        # Static content (goal) leads, volatile content (history, page)
+        # follows — a byte-identical prefix lets Anthropic's server-side
+        # prompt caching reuse the processed instructions+goal across the
+        # session's turns. The claude CLI attaches cache_control to its
+        # requests itself; our job is only to keep the prefix stable, so
+        # nothing session-varying may be inserted above this line.
+        prompt_parts = [f"GOAL: {goal}", ""]
+
+        # Include action history so AI knows what it already tried; the
+        # lines are formatted once per step and bounded by the deque. Only
+        # the last 5 steps go in verbatim — older ones collapse to a count,
+        # since their token cost buys Claude almost no signal
+        if self._history_lines:
             prompt_parts.append("Previous actions this session:")
-            for i, step in enumerate(history[-10:], 1):
-                prompt_parts.append(f"  {i}. {step.action} — {step.reason or ''}")
-                if step.error:
-                    prompt_parts.append(f"     ERROR: {step.error}")
+            entries = list(self._history_lines)
+            recent = entries[-5:]
+            omitted = len(self.steps) - len(recent)
+            if omitted > 0:
+                common = Counter(a for a, _ in entries[:-5]).most_common(1)
+                mostly = f" (mostly {common[0][0]})" if common else ""
+                prompt_parts.append(f"  ... {omitted} earlier actions{mostly} ...")
+            prompt_parts.extend(line for _, line in recent)
             prompt_parts.append("")
 
-        prompt_parts.append(f"GOAL: {goal}")
-        prompt_parts.append("")
         prompt_parts.append(page_context)
         prompt_parts.append("")
         prompt_parts.append("What is the next action?")
 
         user_prompt = "\n".join(prompt_parts)
-        text = call_claude_cli(SYSTEM_PROMPT, user_prompt)
 
-        # Try to extract JSON from the response
-        # Handle cases where AI wraps JSON in markdown code blocks
-        json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-        if json_match:
-            text = json_match.group(1)
+        # The prompt embeds goal, history tail, and cleaned page context —
+        # an identical prompt means the same decision, so skip the subprocess
+        raw = self._ai_cache.get(SYSTEM_PROMPT, user_prompt)
+        if raw is not None:
+            logger.info("  AI response cache hit — skipping Claude call")
+            return ScraperAction.from_dict(raw)
+
+        text = call_claude_cli(SYSTEM_PROMPT, user_prompt)
 
+        # Try to extract JSON from the response; the linear brace scan also
+        # handles responses wrapped in markdown code fences. Parsing starts
+        # once the stream ends — with the CLI the final output byte and the
+        # closing brace coincide, so an incremental parser couldn't finish
+        # any sooner than this single pass over the (≤ few KB) reply.
         raw = None
         try:
-            raw = json.loads(text)
-        except json.JSONDecodeError:
-            brace_match = re.search(r"\{.*\}", text, re.DOTALL)
-            if brace_match:
+            raw = _json_loads(text)
+        except ValueError:  # covers both orjson and stdlib decode errors
+            candidate = _find_json_object(text)
+            if candidate:
                 try:
-                    raw = json.loads(brace_match.group())
-                except json.JSONDecodeError:
+                    raw = _json_loads(candidate)
+                except ValueError:
                     pass
 
         if raw is None:
             return ScraperAction(action="fail", reason=f"AI returned invalid JSON: {text[:200]}")
 
+        self._ai_cache.put(SYSTEM_PROMPT, user_prompt, raw)
         return ScraperAction.from_dict(raw)
 
+    # --- per-action handlers -------------------------------------------
+
+    def _wait_for_page(self, timeout: float):
+        """Wait for the document to settle, returning as soon as it's ready
+        instead of always sleeping the full timeout."""
+        try:
+            WebDriverWait(self.dm.driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            pass
+        except Exception:
+            time.sleep(timeout)
+
+    def _action_click(self, action):
+        by_css = ("css selector", action.selector)
+        elements = self.dm.driver.find_elements(*by_css)
+        if not elements:
+            return f"No elements found for selector: {action.selector}"
+        self.dm.scroll_to_view(elements[0])
+        # Wait until it's actually clickable instead of a blind 0.3s sleep
+        try:
+            element = WebDriverWait(self.dm.driver, 2).until(
+                EC.element_to_be_clickable(by_css)
+            )
+        except TimeoutException:
+            element = elements[0]
+        old_root = self.dm.driver.find_element("tag name", "html")
+        element.click()
+        # A navigating click replaces the document root, but readyState on
+        # the old document still reports "complete" — watch briefly for
+        # root staleness and only then wait for the new DOM to settle
+        try:
+            WebDriverWait(self.dm.driver, 1).until(EC.staleness_of(old_root))
+        except TimeoutException:
+            return  # same-document click; nothing to wait for
+        except Exception:
+            pass
+        self._wait_for_page(5)
+
+    def _action_type(self, action):
+        elements = self.dm.driver.find_elements("css selector", action.selector)
+        if not elements:
+            return f"No elements found for selector: {action.selector}"
+        element = elements[0]
+        self.dm.scroll_to_view(element)
+        element.clear()
+        element.send_keys(action.text)
+        self._wait_for_page(0.5)
+
+    def _action_scroll_down(self, action):
+        self.dm.scroll_by(600)
+        self._wait_for_page(0.5)
+
+    def _action_scroll_up(self, action):
+        self.dm.scroll_by(-600)
+        self._wait_for_page(0.5)
+
+    def _action_goto(self, action):
+        self.dm.get(action.url)
+        self._wait_for_page(2)
+
+    def _action_wait(self, action):
+        time.sleep(action.seconds or 2)
+
+    def _action_noop(self, action):
+        pass  # extract/done/fail are handled by the caller
+
     def _execute_action(self, action: ScraperAction) -> str | None:
         """Execute a browser action. Returns error string or None on success."""
-        try:
-            if action.action == "click":
-                elements = self.dm.driver.find_elements("css selector", action.selector)
-                if not elements:
-                    return f"No elements found for selector: {action.selector}"
-                element = elements[0]
-                self.dm.scroll_to_view(element)
-                time.sleep(0.3)
-                element.click()
-                time.sleep(1)
-
-            elif action.action == "type":
-                elements = self.dm.driver.find_elements("css selector", action.selector)
-                if not elements:
-                    return f"No elements found for selector: {action.selector}"
-                element = elements[0]
-                self.dm.scroll_to_view(element)
-                element.clear()
-                element.send_keys(action.text)
-                time.sleep(0.5)
-
-            elif action.action == "scroll_down":
-                self.dm.scroll_by(600)
-                time.sleep(0.5)
-
-            elif action.action == "scroll_up":
-                self.dm.scroll_by(-600)
-                time.sleep(0.5)
-
-            elif action.action == "goto":
-                self.dm.get(action.url)
-                time.sleep(2)
-
-            elif action.action == "wait":
-                time.sleep(action.seconds or 2)
-
-            elif action.action in ("extract", "done", "fail"):
-                pass  # Handled by caller
-
-            else:
-                return f"Unknown action: {action.action}"
+        handler = self._action_dispatch.get(action.action)
+        if handler is None:
+            return f"Unknown action: {action.action}"
 
+        try:
+            return handler(action)
         except ElementClickInterceptedException as e:
             return f"Click intercepted: {e}"
         except StaleElementReferenceException:
@@ -463,8 +1019,6 @@ class WebScraper:
         except Exception as e:
             return f"Action error: {e}"
 
-        return None
-
     def _discover_apis(self) -> list:
         """Run network traffic analysis to find API endpoints."""
         try:
@@ -486,6 +1040,10 @@ class WebScraper:
         """
         self._init_browser()
         self.steps: list[ScraperStep] = []
+        self._history_lines.clear()
+        self._extracted_buffers.clear()
+        self._heuristic_waits = 0
+        self._cookie_dismissed = False
 
         def _make_step(step_num: int, action: ScraperAction, error: str | None = None) -> ScraperStep:
             return ScraperStep(
@@ -500,24 +1058,59 @@ class WebScraper:
                 error=error,
             )
 
+        def _record(step: ScraperStep):
+            self.steps.append(step)
+            line = f"  {step.step}. {step.action} — {step.reason or ''}"
+            if step.action == "extract" and step.data:
+                line += f" [extracted {len(step.data)} fields]"
+            if step.error:
+                line += f"\n     ERROR: {step.error}"
+            self._history_lines.append((step.action, line))
+
         result = None
+        recent_hashes: deque = deque(maxlen=3)
         try:
             logger.info(f"Starting scrape: {goal}")
             logger.info(f"Navigating to: {start_url}")
             self.dm.get(start_url)
-            time.sleep(2)
+            self._wait_for_page(2)
 
             for step_num in range(1, self.max_steps + 1):
                 logger.info(f"Step {step_num}/{self.max_steps}")
 
                 page_context = self._get_page_context()
-                action = self._ask_ai(goal, page_context, self.steps)
+                ctx_hash = self._last_ctx_hash
+
+                # Stuck-loop detector: a click/goto that reported success but
+                # left the page identical to a recent state means we're going
+                # in circles — fail fast instead of burning another Claude
+                # call. Scroll/type/wait are excluded since the cleaned
+                # context legitimately doesn't change for those.
+                last = self.steps[-1] if self.steps else None
+                if (
+                    last is not None
+                    and last.error is None
+                    and last.action in ("click", "goto")
+                    and ctx_hash in recent_hashes
+                ):
+                    logger.warning("  Page unchanged after successful navigation — aborting as a loop")
+                    action = ScraperAction(
+                        action="fail",
+                        reason="Detected navigation loop - page unchanged",
+                    )
+                else:
+                    action = self._heuristic_action(page_context)
+                    if action is not None:
+                        logger.info(f"  Heuristic decided: {action.action} — {action.reason}")
+                    else:
+                        action = self._ask_ai(goal, page_context)
+                recent_hashes.append(ctx_hash)
 
                 logger.info(f"  AI decided: {action.action} — {action.reason or ''}")
 
                 # Terminal actions
                 if action.action == "done":
-                    self.steps.append(_make_step(step_num, action))
+                    _record(_make_step(step_num, action))
                     result = ScrapeResult(
                         success=True,
                         result=action.result,
@@ -527,7 +1120,7 @@ class WebScraper:
                     break
 
                 if action.action == "fail":
-                    self.steps.append(_make_step(step_num, action, error=action.reason))
+                    _record(_make_step(step_num, action, error=action.reason))
                     result = ScrapeResult(
                         success=False,
                         error=action.reason,
@@ -536,12 +1129,20 @@ class WebScraper:
                     break
 
                 if action.action == "extract":
-                    self.steps.append(_make_step(step_num, action))
+                    if action.data:
+                        self._extracted_buffers.append(action.data)
+                    _record(_make_step(step_num, action))
                     continue
 
                 # Execute browser action
                 error = self._execute_action(action)
-                self.steps.append(_make_step(step_num, action, error=error))
+                _record(_make_step(step_num, action, error=error))
+
+                # Clean the post-action DOM in the background so the next
+                # context build is a memo hit. No explicit invalidation is
+                # needed when goto/click lands late: the memo is keyed by
+                # HTML hash, so a stale speculation just misses.
+                self._ctx_future = self._bg_executor.submit(self._speculate_context)
 
                 if error:
                     logger.warning(f"  Action error: {error}")
@@ -562,16 +1163,116 @@ class WebScraper:
                 steps=self.steps,
             )
 
+        # Reassemble buffered extractions into the final payload on every
+        # exit path — fail and max-steps included — so partial extractions
+        # survive; explicit result data wins on key clashes
+        if self._extracted_buffers:
+            merged: dict = {}
+            for buf in self._extracted_buffers:
+                merged.update(buf)
+            merged.update(result.data or {})
+            result.data = merged
+
+        # Join any in-flight speculation before touching CDP again — on the
+        # max-steps and exception exits the last future submitted after an
+        # action would otherwise still be driving the browser while
+        # _discover_apis() reads network logs
+        fut = self._ctx_future
+        if fut is not None:
+            self._ctx_future = None
+            try:
+                fut.result(timeout=30)
+            except Exception:
+                pass
+
         # Discover API endpoints from network traffic
         result.discovered_apis = self._discover_apis()
         return result
 
+    def reset(self):
+        """Clear per-job state but keep the browser warm for the next job.
+
+        Chrome startup costs seconds; a pooled scraper only needs its
+        cookies, network logs, and per-scrape caches dropped between jobs.
+        """
+        if self.dm:
+            # delete_all_cookies() only clears the current domain's cookies,
+            # which would leak sessions between pooled jobs — clear everything
+            # via CDP instead. Failures propagate so the pool closes the
+            # browser rather than reusing a dirty one.
+            self.dm.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            self.dm.driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin",
+                {"origin": "*", "storageTypes": "all"},
+            )
+            self.dm.get("about:blank")
+            try:
+                self.dm.clear_network_logs()
+            except Exception:
+                pass
+        self._ctx_cache.clear()
+        self._last_ctx_hash = None
+        self._ctx_future = None
+        self._history_lines.clear()
+        self._extracted_buffers.clear()
+        self._heuristic_waits = 0
+        self._cookie_dismissed = False
+
     def close(self):
+        self._bg_executor.shutdown(wait=False)
         if self.dm:
             self.dm.close()
             self.dm = None
 
 
+class WebScraperPool:
+    """Pool of warm WebScraper instances for many-site workloads.
+
+    acquire() hands back an idle scraper reset to a clean state — or a
+    fresh one when the pool is empty — so repeated jobs skip the multi-
+    second Chrome spawn. release() returns it for reuse; scrapers beyond
+    max_pool_size, or ones whose reset fails, are closed instead.
+    """
+
+    def __init__(self, max_pool_size: int = 4, headless: bool = True, max_steps: int = 20):
+        self.max_pool_size = max_pool_size
+        self._spec = (headless, max_steps)
+        self._idle: list[WebScraper] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> WebScraper:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        headless, max_steps = self._spec
+        return WebScraper(headless=headless, max_steps=max_steps)
+
+    def release(self, scraper: WebScraper):
+        try:
+            scraper.reset()
+        except Exception:
+            logger.warning("Scraper reset failed — closing instead of pooling")
+            scraper.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.max_pool_size:
+                self._idle.append(scraper)
+                return
+        scraper.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for scraper in idle:
+            scraper.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def run_scraper(goal: str, start_url: str, headless: bool = True, max_steps: int = 20) -> ScrapeResult:
     """Convenience function to run a scrape and clean up."""
     scraper = WebScraper(headless=headless, max_steps=max_steps)
@@ -581,6 +1282,38 @@ def run_scraper(goal: str, start_url: str, headless: bool = True, max_steps: int
         scraper.close()
 
 
+def run_scrapers_batch(
+    jobs: list[tuple[str, str]],
+    headless: bool = True,
+    max_steps: int = 20,
+    max_workers: int = 4,
+) -> list[ScrapeResult]:
+    """Run several independent scrapes concurrently.
+
+    Each (goal, start_url) job gets its own browser and scraper; results
+    come back in job order. The win is wall-clock overlap — one job's
+    Claude call runs while another's page loads — so N jobs finish in
+    roughly the time of the slowest few rather than the sum of all.
+    """
+    if not jobs:
+        return []
+    workers = min(max_workers, len(jobs))
+    # A pool sized to the worker count means jobs beyond the first wave
+    # reuse a warm browser instead of spawning Chrome again
+    with WebScraperPool(max_pool_size=workers, headless=headless, max_steps=max_steps) as pool:
+
+        def _job(goal: str, url: str) -> ScrapeResult:
+            scraper = pool.acquire()
+            try:
+                return scraper.scrape(goal, url)
+            finally:
+                pool.release(scraper)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_job, goal, url) for goal, url in jobs]
+            return [f.result() for f in futures]
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -605,7 +1338,7 @@ if __name__ == "__main__":
     if result.result:
         print(f"RESULT: {result.result}")
     if result.data:
-        print(f"DATA: {json.dumps(result.data, indent=2)}")
+        print(f"DATA: {_json_dumps_pretty(result.data)}")
     if result.error:
         print(f"ERROR: {result.error}")
     print(f"STEPS: {len(result.steps)}")